@@ -3,8 +3,6 @@
 Module: comprehensive_analyzer.py
 Description: Orchestrates all lie detection analyzers for comprehensive project analysis
 
-"""
-
 External Dependencies:
 - None (uses local analyzers)
 
@@ -31,6 +29,8 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 import json
 import asyncio
+import logging
+from logging.handlers import MemoryHandler
 
 # Import all our analyzers
 from .mock_detector import MockDetector
@@ -49,6 +49,7 @@ class ComprehensiveAnalyzer:
     def __init__(self, verbose: bool = True):
         """Initialize all analyzers."""
         self.verbose = verbose
+        self.logger = self._setup_logging()
         
         # Initialize analyzers
         self.mock_detector = MockDetector()
@@ -60,14 +61,45 @@ class ComprehensiveAnalyzer:
         self.claim_verifier = ClaimVerifier()
         self.hallucination_monitor = HallucinationMonitor()
         
+    def _setup_logging(self) -> logging.Logger:
+        """Set up buffered progress logging, flushed once per analysis.
+
+        Each analyzer logs through its own child of the module logger, so its
+        verbosity never leaks into other instances. Progress goes only to that
+        logger's console buffer (not up to the root logger), and only when
+        verbose.
+        """
+        logger = logging.getLogger(f"{__name__}.{id(self)}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO if self.verbose else logging.WARNING)
+
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(logging.Formatter('%(message)s'))
+        self._log_buffer = MemoryHandler(
+            capacity=64, flushLevel=logging.CRITICAL, target=console
+        )
+        # A new analyzer can get the id, and so the logger, of a collected one
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(self._log_buffer)
+
+        return logger
+
     def analyze_project(self, project_path: str) -> Dict[str, Any]:
         """Run all analyzers on a project."""
         project_path = Path(project_path)
         if not project_path.exists():
             return {"error": f"Project path not found: {project_path}"}
-        
-        if self.verbose:
-            print(f"\n🔍 Analyzing project: {project_path.name}")
+
+        # Progress messages are buffered and written out in one go
+        try:
+            return self._run_analyzers(project_path)
+        finally:
+            self._log_buffer.flush()
+    
+    def _run_analyzers(self, project_path: Path) -> Dict[str, Any]:
+        """Run each analyzer in turn and score the combined results."""
+        self.logger.info("\n🔍 Analyzing project: %s", project_path.name)
         
         results = {
             "project": str(project_path),
@@ -81,45 +113,38 @@ class ComprehensiveAnalyzer:
         }
         
         # 1. Real-time test execution monitoring
-        if self.verbose:
-            print("   📊 Running real-time test monitor...")
+        self.logger.info("   📊 Running real-time test monitor...")
         rt_results = self.realtime_monitor.monitor_test_execution(str(project_path))
         results["analyzers"]["realtime_monitor"] = rt_results
         
         # 2. Mock detection in tests
-        if self.verbose:
-            print("   🎭 Detecting mock abuse...")
+        self.logger.info("   🎭 Detecting mock abuse...")
         mock_results = self.mock_detector.scan_project(str(project_path))
         results["analyzers"]["mock_detector"] = mock_results
         
         # 3. Implementation verification
-        if self.verbose:
-            print("   💀 Checking for skeleton code...")
+        self.logger.info("   💀 Checking for skeleton code...")
         impl_results = self.implementation_verifier.scan_project(str(project_path))
         results["analyzers"]["implementation_verifier"] = impl_results
         
         # 4. Honeypot enforcement
-        if self.verbose:
-            print("   🍯 Checking honeypot integrity...")
+        self.logger.info("   🍯 Checking honeypot integrity...")
         # Use real-time test results for honeypot check
         honeypot_results = self.honeypot_enforcer.check_honeypot_integrity(rt_results)
         results["analyzers"]["honeypot_enforcer"] = honeypot_results
         
         # 5. Pattern analysis
-        if self.verbose:
-            print("   🔍 Analyzing deception patterns...")
+        self.logger.info("   🔍 Analyzing deception patterns...")
         pattern_results = self.pattern_analyzer.analyze_project(str(project_path))
         results["analyzers"]["pattern_analyzer"] = pattern_results
         
         # 6. Claim verification
-        if self.verbose:
-            print("   ✅ Verifying implementation claims...")
+        self.logger.info("   ✅ Verifying implementation claims...")
         claim_results = self.claim_verifier.verify_project_claims(str(project_path))
         results["analyzers"]["claim_verifier"] = claim_results
         
         # 7. Hallucination monitoring
-        if self.verbose:
-            print("   🌀 Detecting hallucinations...")
+        self.logger.info("   🌀 Detecting hallucinations...")
         hall_results = self.hallucination_monitor.analyze_project(str(project_path))
         results["analyzers"]["hallucination_monitor"] = hall_results
         
@@ -179,7 +204,8 @@ class ComprehensiveAnalyzer:
         
         # Hallucination factor
         hall_data = results["analyzers"].get("hallucination_monitor", {})
-        hallucination_count = len(hall_data.get("hallucinations", []))
+        hallucinations = hall_data.get("hallucinations") or ()
+        hallucination_count = len(hallucinations)
         if hallucination_count > 0:
             deception_factors.append(("hallucinations", min(hallucination_count / 10, 1.0)))
             results["deception_indicators"].append("hallucinations")
@@ -8,7 +8,6 @@ Description: Verifies that functions have real implementations, not just skeleto
 
 External Dependencies:
 - ast: https://docs.python.org/3/library/ast.html
-- tokenize: https://docs.python.org/3/library/tokenize.html
 
 Sample Input:
 >>> code = '''
@@ -34,16 +33,171 @@ Example Usage:
 """
 
 import ast
-import tokenize
+import hashlib
+import mmap
+import os
+import pickle
+import pickletools
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
-import io
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple, Union
+
+# Bump whenever analyze_code output changes so stale cache entries are ignored
+VERIFIER_VERSION = "2"
+
+# Comment markers that flag a function as unfinished, in order of precedence
+SKELETON_MARKERS = ('TODO', 'FIXME', 'XXX')
+MARKER_RE = re.compile('|'.join(SKELETON_MARKERS))
+
+# Node types counted as real implementation logic. AST nodes are always
+# exact instances, so a set lookup on type() replaces the isinstance chain.
+_REAL_STMT_TYPES = frozenset({
+    ast.Assign, ast.AugAssign, ast.AnnAssign,
+    ast.For, ast.While, ast.If,
+    ast.With, ast.Try, ast.Return,
+    ast.Yield, ast.YieldFrom,
+    ast.Call, ast.Expr,
+})
+
+# Node fields holding nested statement blocks (or handlers/cases wrapping them)
+_BLOCK_FIELDS = frozenset({'body', 'orelse', 'finalbody', 'handlers', 'cases'})
+
+# Directories never descended into when collecting project sources
+_PRUNE_DIRS = frozenset({'__pycache__', '.git', '.venv', 'node_modules'})
+
+# Files larger than this are memory-mapped rather than read into memory
+MMAP_THRESHOLD = 1 << 20
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 8
+
+def _is_docstring_value(value: ast.expr) -> bool:
+    """True for a string constant (ast.Str is a deprecated alias for this)."""
+    return type(value) is ast.Constant and type(value.value) is str
+
+
+def _is_ellipsis_value(value: ast.expr) -> bool:
+    """True for a bare ``...`` (ast.Ellipsis is a deprecated alias for this)."""
+    return type(value) is ast.Constant and value.value is Ellipsis
+
+
+def _is_not_implemented_call(exc: Optional[ast.expr]) -> bool:
+    """True for ``NotImplementedError(...)`` as a raised expression."""
+    return (isinstance(exc, ast.Call) and isinstance(exc.func, ast.Name) and
+            exc.func.id == 'NotImplementedError')
+
+
+def _iter_source_files(root: str) -> Iterator[str]:
+    """Yield non-test Python files under root, skipping pruned directories."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in _PRUNE_DIRS:
+                            stack.append(entry.path)
+                    elif name.endswith('.py') and "test_" not in name and entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def _decode_source(source: Union[bytes, mmap.mmap]) -> str:
+    """Decode file contents with the newline translation of text-mode reads.
+
+    ast treats a lone '\\r' as a line break, and marker lines are counted
+    by '\\n' only, so CR and CRLF endings are normalized first.
+    """
+    code = str(source, 'utf-8')
+    if '\r' in code:
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
+    return code
+
+
+# Recently parsed trees, keyed by a digest of their source
+AST_CACHE_SIZE = 128
+_ast_cache: "OrderedDict[str, ast.Module]" = OrderedDict()
+_ast_cache_lock = threading.Lock()
+
+
+def _parse(code: str) -> ast.Module:
+    """Parse code, reusing the tree if the same source was parsed recently.
+
+    Cached trees are shared, so callers must treat them as read-only.
+    """
+    key = hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+    with _ast_cache_lock:
+        tree = _ast_cache.get(key)
+        if tree is not None:
+            _ast_cache.move_to_end(key)
+            return tree
+
+    tree = ast.parse(code)
+    with _ast_cache_lock:
+        _ast_cache[key] = tree
+        if len(_ast_cache) > AST_CACHE_SIZE:
+            _ast_cache.popitem(last=False)
+    return tree
+
+
+# (total, skeleton, implemented) counts, skeleton-file entry, patterns, async skeletons
+FileSummary = Tuple[Tuple[int, int, int], Optional[Dict[str, Any]],
+                    Dict[str, List[str]], List[str]]
+
+# Per-process verifier used by scan_project's worker pool
+_worker_verifier = None
+
+
+def _init_worker(verifier: "ImplementationVerifier") -> None:
+    """Install the verifier for this worker process (pickled once per worker)."""
+    global _worker_verifier
+    _worker_verifier = verifier
+
+
+def _analyze_file_output(verifier: "ImplementationVerifier", file_path: str,
+                         keep_file_result: bool) -> Any:
+    """Full result when it is kept, otherwise just the aggregate summary."""
+    if keep_file_result:
+        return verifier.analyze_file(file_path)
+    return verifier.analyze_file_summary(file_path)
+
+
+def _analyze_file_worker(file_path: str, keep_file_result: bool) -> Any:
+    """Analyze one file in a worker process."""
+    return _analyze_file_output(_worker_verifier, file_path, keep_file_result)
 
 
 class ImplementationVerifier:
     """Verifies that code has real implementations, not just placeholders."""
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, cache_ttl_days: float = 30.0,
+                 optimize_cache: bool = False):
+        """Initialize the verifier.
+
+        Args:
+            cache_dir: Directory for the on-disk result cache (disabled when None).
+                Entries are pickles and loading one can run arbitrary code, so
+                only use a directory that untrusted users can't write to.
+            cache_ttl_days: Cache entries older than this are removed
+            optimize_cache: Run pickletools.optimize on entries (smaller, faster
+                to load, slower to write)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl = cache_ttl_days * 86400
+        self.optimize_cache = optimize_cache
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._prune_cache()
+
         self.min_implementation_lines = 3  # Minimum lines for a "real" function
         self.skeleton_indicators = {
             'pass': 'Empty function with pass',
@@ -54,12 +208,19 @@ class ImplementationVerifier:
             'XXX': 'Contains XXX marker'
         }
 
-    def scan_project(self, project_path: str) -> Dict[str, Any]:
-        """Scan all Python files in a project for skeleton code."""
-        project_path = Path(project_path)
+    def scan_project(self, project_path: str, max_workers: Optional[int] = None,
+                     keep_file_results: bool = False) -> Dict[str, Any]:
+        """Scan all Python files in a project for skeleton code.
+
+        Files are analyzed serially unless max_workers > 1 opts in to a
+        process pool of that many workers (used only for projects with at
+        least PARALLEL_MIN_FILES files). Full per-file results are only kept
+        under "file_results" when keep_file_results is set.
+        """
+        project_path = str(Path(project_path))
 
         results = {
-            "project": str(project_path),
+            "project": project_path,
             "total_files": 0,
             "total_functions": 0,
             "skeleton_functions": 0,
@@ -67,41 +228,28 @@ class ImplementationVerifier:
             "skeleton_files": [],
             "file_results": {},
             "overall_skeleton_ratio": 0.0,
-            "skeleton_patterns": {},
+            "skeleton_patterns": defaultdict(list),
             "async_skeleton_functions": []
         }
 
-        # Scan all Python files
-        for py_file in project_path.rglob("*.py"):
-            # Skip test files and __pycache__
-            if "__pycache__" in str(py_file) or "test_" in py_file.name:
-                continue
-
-            results["total_files"] += 1
-            file_result = self.analyze_file(str(py_file))
-            results["file_results"][str(py_file)] = file_result
-
-            # Update totals
-            results["total_functions"] += file_result["total_functions"]
-            results["skeleton_functions"] += file_result["skeleton_count"]
-            results["implemented_functions"] += file_result["implemented_count"]
-
-            # Track skeleton files
-            if file_result["skeleton_ratio"] > 0.5:
-                results["skeleton_files"].append({
-                    "file": str(py_file),
-                    "skeleton_ratio": file_result["skeleton_ratio"],
-                    "skeleton_functions": file_result["skeleton_functions"]
-                })
-
-            # Track async skeleton functions
-            results["async_skeleton_functions"].extend(file_result.get("async_skeleton_functions", []))
-
-            # Aggregate skeleton patterns
-            for pattern, funcs in file_result.get("skeleton_patterns", {}).items():
-                if pattern not in results["skeleton_patterns"]:
-                    results["skeleton_patterns"][pattern] = []
-                results["skeleton_patterns"][pattern].extend(funcs)
+        # Collect all Python files, skipping test files and __pycache__
+        files = list(_iter_source_files(project_path))
+        results["total_files"] = len(files)
+
+        # Serial by default: callers like ComprehensiveAnalyzer may run this
+        # from threads or an event loop, where forking workers is unsafe
+        n_workers = max_workers or 1
+        if n_workers == 1 or len(files) < PARALLEL_MIN_FILES:
+            file_outputs = (_analyze_file_output(self, file_path, keep_file_results)
+                            for file_path in files)
+            self._merge_file_outputs(results, files, file_outputs)
+        else:
+            chunksize = max(1, len(files) // (4 * n_workers))
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                file_outputs = executor.map(_analyze_file_worker, files,
+                                            repeat(keep_file_results), chunksize=chunksize)
+                self._merge_file_outputs(results, files, file_outputs)
 
         # Calculate overall ratio
         if results["total_functions"] > 0:
@@ -109,15 +257,75 @@ class ImplementationVerifier:
                 results["skeleton_functions"] / results["total_functions"]
             )
 
+        results["skeleton_patterns"] = dict(results["skeleton_patterns"])
         return results
 
+    def _merge_file_outputs(self, results: Dict[str, Any], files: List[str],
+                            file_outputs: Iterable[Any]) -> None:
+        """Fold each file's summary (or full result) into the project totals."""
+        file_results = results["file_results"]
+        skeleton_files = results["skeleton_files"]
+        skeleton_patterns = results["skeleton_patterns"]
+        async_skeleton_functions = results["async_skeleton_functions"]
+
+        for file_path, output in zip(files, file_outputs):
+            if isinstance(output, dict):
+                file_results[file_path] = output
+                output = self._summarize_file_result(file_path, output)
+            totals, skeleton_file, patterns, async_funcs = output
+
+            # Update totals
+            results["total_functions"] += totals[0]
+            results["skeleton_functions"] += totals[1]
+            results["implemented_functions"] += totals[2]
+
+            # Track skeleton files
+            if skeleton_file is not None:
+                skeleton_files.append(skeleton_file)
+
+            # Track async skeleton functions and aggregate skeleton patterns
+            async_skeleton_functions.extend(async_funcs)
+            for pattern, funcs in patterns.items():
+                skeleton_patterns[pattern].extend(funcs)
+
+    def analyze_file_summary(self, file_path: str) -> FileSummary:
+        """Analyze a file, returning only what scan_project aggregates.
+
+        Returns ((total, skeleton, implemented) counts, skeleton-file entry or
+        None, skeleton patterns, async skeleton functions). This is what
+        worker processes send back, keeping the pickled payload small.
+        """
+        return self._summarize_file_result(file_path, self.analyze_file(file_path))
+
+    @staticmethod
+    def _summarize_file_result(file_path: str, file_result: Dict[str, Any]) -> FileSummary:
+        """Reduce a full analyze_file result to its aggregate contributions."""
+        skeleton_file = None
+        if file_result["skeleton_ratio"] > 0.5:
+            skeleton_file = {
+                "file": file_path,
+                "skeleton_ratio": file_result["skeleton_ratio"],
+                "skeleton_functions": file_result["skeleton_functions"]
+            }
+
+        totals = (file_result["total_functions"], file_result["skeleton_count"],
+                  file_result["implemented_count"])
+        return (totals, skeleton_file, file_result.get("skeleton_patterns", {}),
+                file_result.get("async_skeleton_functions", []))
+
     def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze a single Python file for skeleton implementations."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            return self.analyze_code(content, filename=file_path)
+            # Read raw bytes: the cache key is taken straight from them and
+            # decoding is only paid for on a cache miss
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                    # Map large files instead of copying them into a bytes object
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                        return self._analyze_source(source, file_path)
+                source = f.read()
+
+            return self._analyze_source(source, file_path)
         except Exception as e:
             return {
                 "error": f"Failed to analyze {file_path}: {str(e)}",
@@ -127,6 +335,71 @@ class ImplementationVerifier:
                 "skeleton_ratio": 0.0
             }
 
+    def _analyze_source(self, source: Union[bytes, mmap.mmap], file_path: str) -> Dict[str, Any]:
+        """Analyze raw file contents, going through the result cache if enabled."""
+        if self.cache_dir is None:
+            return self.analyze_code(_decode_source(source), filename=file_path)
+
+        # Unchanged sources are served from the cache without re-parsing
+        cache_file = self._cache_path(source)
+        result = self._load_cached(cache_file)
+        if result is not None:
+            result["filename"] = file_path
+            return result
+
+        result = self.analyze_code(_decode_source(source), filename=file_path)
+        self._store_cached(cache_file, result)
+        return result
+
+    def _cache_path(self, source: Union[bytes, mmap.mmap]) -> Path:
+        """Cache file for a source, keyed by its SHA-256 and the verifier version."""
+        key = hashlib.sha256(source).hexdigest()
+        return self.cache_dir / f"{key}-{VERIFIER_VERSION}.pkl"
+
+    def _load_cached(self, cache_file: Path) -> Optional[Dict[str, Any]]:
+        """Load a cached result, or None on a miss or unreadable entry.
+
+        The cache directory must be trusted: pickle.load executes code.
+        """
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or stale entries fail in many ways (EOFError,
+            # AttributeError, ImportError, ValueError, ...); drop the entry
+            # and treat it as a miss so the file is re-analyzed
+            try:
+                cache_file.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+
+    def _store_cached(self, cache_file: Path, result: Dict[str, Any]) -> None:
+        """Write a result to the cache; failures only cost a future re-parse."""
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.optimize_cache:
+            data = pickletools.optimize(data)
+
+        # Write then rename so concurrent scans never see a partial entry
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+
+    def _prune_cache(self) -> None:
+        """Remove cache entries older than the configured TTL."""
+        cutoff = time.time() - self.cache_ttl
+        for entry in self.cache_dir.glob("*.pkl"):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    entry.unlink()
+            except OSError:
+                continue
+
     def analyze_code(self, code: str, filename: str = "<string>") -> Dict[str, Any]:
         """Analyze Python code for skeleton implementations."""
         results = {
@@ -143,7 +416,7 @@ class ImplementationVerifier:
         }
 
         try:
-            tree = ast.parse(code)
+            tree = _parse(code)
             analyzer = SkeletonAnalyzer(code)
             analyzer.visit(tree)
 
@@ -166,12 +439,21 @@ class ImplementationVerifier:
         return results
 
 
+@dataclass
+class _BodyScan:
+    """Facts about a function gathered in a single walk of its subtree."""
+    real_lines: int = 0
+    has_not_implemented: bool = False
+    has_ellipsis: bool = False
+    has_await: bool = False
+
+
 class SkeletonAnalyzer(ast.NodeVisitor):
     """AST visitor to analyze function implementations."""
 
     def __init__(self, source_code: str):
         self.source_code = source_code
-        self.source_lines = source_code.splitlines()
+        self._marker_lines = self._find_marker_lines(source_code)
         self.all_functions = []
         self.skeleton_functions = []
         self.implemented_functions = []
@@ -180,6 +462,30 @@ class SkeletonAnalyzer(ast.NodeVisitor):
         self.class_analysis = {}
         self.current_class = None
 
+    @staticmethod
+    def _find_marker_lines(source_code: str) -> Dict[str, List[int]]:
+        """Map each marker to the sorted line numbers it appears on."""
+        marker_lines = {marker: [] for marker in SKELETON_MARKERS}
+        count = source_code.count
+        line, pos = 1, 0
+        for match in MARKER_RE.finditer(source_code):
+            start = match.start()
+            line += count('\n', pos, start)
+            pos = start
+            marker_lines[match.group()].append(line)
+        return marker_lines
+
+    def generic_visit(self, node):
+        """Descend into nested statement blocks only.
+
+        Functions and classes can only be defined by statements, so the
+        expression subtrees that make up most of an AST are never visited.
+        """
+        for field in node._fields:
+            if field in _BLOCK_FIELDS:
+                for child in getattr(node, field):
+                    self.visit(child)
+
     def visit_ClassDef(self, node):
         """Track class definitions."""
         old_class = self.current_class
@@ -204,113 +510,133 @@ class SkeletonAnalyzer(ast.NodeVisitor):
 
     def _analyze_function(self, node, is_async: bool):
         """Analyze a function or method for skeleton patterns."""
+        current_class = self.current_class
         func_name = node.name
-        if self.current_class:
-            func_name = f"{self.current_class}.{node.name}"
+        if current_class:
+            func_name = f"{current_class}.{node.name}"
 
         self.all_functions.append(func_name)
 
-        # Count real implementation lines
-        real_lines = self._count_real_lines(node)
-
         # Check for skeleton patterns
-        is_skeleton, pattern = self._is_skeleton_function(node, real_lines)
+        is_skeleton, pattern = self._is_skeleton_function(node)
 
         if is_skeleton:
             self.skeleton_functions.append(func_name)
-            if pattern not in self.skeleton_patterns:
-                self.skeleton_patterns[pattern] = []
-            self.skeleton_patterns[pattern].append(func_name)
+            self.skeleton_patterns.setdefault(pattern, []).append(func_name)
 
             if is_async:
                 self.async_skeleton_functions.append(func_name)
-
-            if self.current_class:
-                self.class_analysis[self.current_class]["skeleton_methods"] += 1
         else:
             self.implemented_functions.append(func_name)
-            if self.current_class:
-                self.class_analysis[self.current_class]["implemented_methods"] += 1
 
-        if self.current_class:
-            self.class_analysis[self.current_class]["methods"] += 1
+        if current_class:
+            class_stats = self.class_analysis[current_class]
+            class_stats["skeleton_methods" if is_skeleton else "implemented_methods"] += 1
+            class_stats["methods"] += 1
 
-    def _count_real_lines(self, node) -> int:
-        """Count lines with real implementation logic."""
-        real_lines = 0
+    def _scan_body(self, node) -> _BodyScan:
+        """Walk a function once, counting real logic and noting placeholders."""
+        scan = _BodyScan()
 
-        for child in ast.walk(node):
-            # Skip the function definition itself
-            if child == node:
-                continue
+        for child in node.body:
+            if isinstance(child, ast.Expr) and _is_ellipsis_value(child.value):
+                scan.has_ellipsis = True
+                break
+
+        # Iterative walk of everything below the function definition itself.
+        # Child fields are expanded inline rather than via ast.walk /
+        # ast.iter_child_nodes, whose generators dominate the cost per node;
+        # visiting order doesn't matter for counting.
+        # Module and builtin names are bound to locals for the hot loop
+        AST, Expr, Raise, Await = ast.AST, ast.Expr, ast.Raise, ast.Await
+        real_types = _REAL_STMT_TYPES
+        _isinstance, _getattr, _type, _list = isinstance, getattr, type, list
+
+        real_lines = 0
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        child = node
+        while True:
+            for field in child._fields:
+                value = _getattr(child, field, None)
+                if _type(value) is _list:
+                    for item in value:
+                        if _isinstance(item, AST):
+                            push(item)
+                elif _isinstance(value, AST):
+                    push(value)
+            if not stack:
+                break
+            child = pop()
 
             # Count statements that represent real logic
-            if isinstance(child, (ast.Assign, ast.AugAssign, ast.AnnAssign,
-                                ast.For, ast.While, ast.If,
-                                ast.With, ast.Try, ast.Return,
-                                ast.Yield, ast.YieldFrom,
-                                ast.Call, ast.Expr)):
+            t = _type(child)
+            if t in real_types:
                 # Don't count docstrings
-                if isinstance(child, ast.Expr) and isinstance(child.value, ast.Str):
-                    continue
-
-                # Don't count pass statements
-                if isinstance(child, ast.Pass):
-                    continue
-
-                # Don't count raise NotImplementedError
-                if isinstance(child, ast.Raise):
-                    if isinstance(child.exc, ast.Call):
-                        if isinstance(child.exc.func, ast.Name):
-                            if child.exc.func.id == 'NotImplementedError':
-                                continue
-
-                real_lines += 1
+                if t is not Expr or not _is_docstring_value(child.value):
+                    real_lines += 1
+            elif t is Raise:
+                if _is_not_implemented_call(child.exc):
+                    scan.has_not_implemented = True
+            elif t is Await:
+                scan.has_await = True
+
+        scan.real_lines = real_lines
+        return scan
+
+    @staticmethod
+    def _placeholder_body_pattern(body: List[ast.stmt]) -> Optional[str]:
+        """Pattern for a body that is a lone placeholder, optionally after a docstring."""
+        if len(body) == 1:
+            stmt = body[0]
+        elif (len(body) == 2 and isinstance(body[0], ast.Expr) and
+                _is_docstring_value(body[0].value)):
+            stmt = body[1]
+        else:
+            return None
 
-        return real_lines
+        if isinstance(stmt, ast.Pass):
+            return "pass"
+        if isinstance(stmt, ast.Raise) and _is_not_implemented_call(stmt.exc):
+            return "NotImplementedError"
+        if isinstance(stmt, ast.Expr) and _is_ellipsis_value(stmt.value):
+            return "..."
+        return None
 
-    def _is_skeleton_function(self, node, real_lines: int) -> tuple[bool, Optional[str]]:
+    def _is_skeleton_function(self, node) -> tuple[bool, Optional[str]]:
         """Determine if a function is skeleton code."""
-        # Check for empty function with pass
-        if len(node.body) == 1 and isinstance(node.body[0], ast.Pass):
-            return True, "pass"
+        # Most skeletons are a lone pass/raise/... and are decided from the
+        # direct body alone, without walking the subtree
+        pattern = self._placeholder_body_pattern(node.body)
+        if pattern is not None:
+            return True, pattern
 
-        # Check for docstring + pass
-        if len(node.body) == 2:
-            if (isinstance(node.body[0], ast.Expr) and
-                isinstance(node.body[0].value, ast.Str) and
-                isinstance(node.body[1], ast.Pass)):
-                return True, "pass"
+        # Gather everything the remaining checks need in one walk
+        scan = self._scan_body(node)
 
         # Check for NotImplementedError
-        for child in ast.walk(node):
-            if isinstance(child, ast.Raise):
-                if isinstance(child.exc, ast.Call):
-                    if isinstance(child.exc.func, ast.Name):
-                        if child.exc.func.id == 'NotImplementedError':
-                            return True, "NotImplementedError"
+        if scan.has_not_implemented:
+            return True, "NotImplementedError"
 
         # Check for ellipsis
-        for child in node.body:
-            if isinstance(child, ast.Expr) and isinstance(child.value, ast.Ellipsis):
-                return True, "..."
+        if scan.has_ellipsis:
+            return True, "..."
 
         # Check for TODO/FIXME markers
-        func_lines = self.source_lines[node.lineno-1:node.end_lineno]
-        func_text = '\n'.join(func_lines)
-        for marker in ['TODO', 'FIXME', 'XXX']:
-            if marker in func_text:
+        for marker in SKELETON_MARKERS:
+            lines = self._marker_lines[marker]
+            i = bisect_left(lines, node.lineno)
+            if i < len(lines) and lines[i] <= node.end_lineno:
                 return True, marker
 
         # Check if too few real implementation lines
-        if real_lines < 3:  # Less than 3 lines of real code
+        if scan.real_lines < 3:  # Less than 3 lines of real code
             return True, "minimal_implementation"
 
         # For async functions, check if they actually await something
-        if isinstance(node, ast.AsyncFunctionDef):
-            has_await = any(isinstance(child, ast.Await) for child in ast.walk(node))
-            if not has_await:
-                return True, "async_without_await"
+        if isinstance(node, ast.AsyncFunctionDef) and not scan.has_await:
+            return True, "async_without_await"
 
         return False, None
 
@@ -1,36 +1,41 @@
-
+#!/usr/bin/env python3
 """
 Module: llm_test_analyzer.py
-Description: Test suite for llm_analyzer functionality
+Description: Sends test reports to an external LLM for fact-checked analysis
 
-"""
-"""
+Features: hallucination prevention, test validation, intelligent insights.
 
 External Dependencies:
-- llm_call: [Documentation URL]
-
-Sample Input:
->>> # Add specific examples based on module functionality
-
-Expected Output:
->>> # Add expected output examples
+- llm_call: LLM client used for the analysis calls
+- orjson (optional): https://github.com/ijl/orjson
 
 Example Usage:
->>> # Add usage examples
-"""
-
-#!/usr/bin/env python3
-"""
-LLM Test Result Analyzer
-
-Purpose: Send test reports to external LLM (Gemini 2.5 Pro) for analysis
-Features: Hallucination prevention, test validation, intelligent insights
+>>> test_results = {"total": 2, "passed": 1, "failed": 1,
+...                 "tests": [{"nodeid": "test_a", "outcome": "failed"}]}
+>>> verifier = TestReportVerifier()
+>>> summary = verifier.create_verified_summary(test_results)
+>>> "Success Rate: 50.0%" in summary, "- test_a: FAILED" in summary
+(True, True)
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import string
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Literal, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+
+from pydantic import BaseModel, ConfigDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     from llm_call import call_llm
@@ -38,21 +43,163 @@ except ImportError:
     call_llm = None
     print("Warning: llm_call module not available. LLM analysis features disabled.")
 
+def _json_loads(data: str) -> Any:
+    """Parse JSON text, using orjson when available.
+
+    Only parsing goes through orjson; everything written out uses the stdlib
+    json module so its format doesn't depend on what is installed.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity and lone surrogates only the stdlib accepts
+            return json.loads(data)
+    return json.loads(data)
+
+
+def _failed_tests(test_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The failed entries of a result's test list, in order (one pass)."""
+    return [t for t in test_results.get("tests", ()) if t.get("outcome") == "failed"]
+
+
+def _truncate_error(error: Any, limit: int = 200) -> str:
+    """Error text for a prompt, cut to limit characters with an ellipsis marker."""
+    text = str(error) if error else "No error message"
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+# Static analysis prompt; only the per-run figures are substituted
+_ANALYSIS_PROMPT = string.Template("""
+You are a test result analyzer. Your job is to provide FACTUAL analysis of test results.
+Never claim tests are passing if they are not. Always base your analysis on the actual data.
+
+Project: $project
+Test Results Summary:
+- Total Tests: $total
+- Passed: $passed
+- Failed: $failed
+- Skipped: $skipped
+- Success Rate: $success_rate%
+
+Failed Tests:
+$failed_tests_json
+
+Analyze these results: classify each failed test and its likely cause, assess
+deployment risk, recommend prioritized actions, and list the facts you state
+together with whether the data above verifies them. Respond with JSON matching
+the provided schema.
+
+IMPORTANT: Base ALL conclusions strictly on the provided data. Do not make assumptions.
+""")
+
+# Responses are only cached for (near-)deterministic calls
+CACHEABLE_TEMPERATURE = 0.2
+
+
+class _StrictModel(BaseModel):
+    # Strict JSON-schema decoding requires closed objects
+    model_config = ConfigDict(extra="forbid")
+
+
+class AnalysisSummary(_StrictModel):
+    overall_status: Literal["passing", "failing", "unstable"]
+    confidence_level: Literal["high", "medium", "low"]
+    actual_pass_rate: float
+    requires_immediate_action: bool
+
+
+class FailedTestAnalysis(_StrictModel):
+    test_name: str
+    failure_category: Literal["assertion", "import", "timeout", "other"]
+    likely_cause: str
+    suggested_fix: str
+
+
+class RiskAssessment(_StrictModel):
+    deployment_ready: bool
+    critical_failures: int
+    blocking_issues: List[str]
+
+
+class Recommendation(_StrictModel):
+    priority: Literal["high", "medium", "low"]
+    action: str
+    reason: str
+
+
+class DataVerification(_StrictModel):
+    all_facts_verified: bool
+    unverified_claims: List[str]
+
+
+class HallucinationCheck(_StrictModel):
+    stated_facts: List[str]
+    data_verification: DataVerification
+
+
+class TestAnalysis(_StrictModel):
+    """Response schema for analyze_test_results."""
+    summary: AnalysisSummary
+    failed_test_analysis: List[FailedTestAnalysis]
+    risk_assessment: RiskAssessment
+    recommendations: List[Recommendation]
+    hallucination_check: HallucinationCheck
+
+
+class IncorrectClaim(_StrictModel):
+    claim: str
+    reality: str
+    severity: Literal["critical", "major", "minor"]
+
+
+class VerificationDetails(_StrictModel):
+    claims_accurate: bool
+    hallucinations_detected: bool
+    incorrect_claims: List[IncorrectClaim]
+    verification_confidence: int
+
+
+class ClaimVerification(_StrictModel):
+    """Response schema for verify_agent_claims."""
+    verification_result: VerificationDetails
+    corrected_summary: str
+
+
+@lru_cache(maxsize=None)
+def _json_schema_format(model: type) -> Dict[str, Any]:
+    """Structured-output response_format for a model (built once per model)."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "strict": True,
+            "schema": model.model_json_schema(),
+        },
+    }
+
 
 class LLMTestAnalyzer:
     """Analyze test results using external LLM to prevent hallucinations."""
 
-    def __init__(self, model: str = "gemini-2.5-pro", temperature: float = 0.1):
+    def __init__(self, model: str = "gemini-2.5-pro", temperature: float = 0.1,
+                 cache_dir: Optional[str] = ".llm_cache", cache_ttl_days: float = 7.0):
         """
         Initialize LLM analyzer.
 
         Args:
             model: LLM model to use
             temperature: Low temperature for factual accuracy
+            cache_dir: Directory for cached LLM responses (disabled when None)
+            cache_ttl_days: Cached responses older than this are not reused
         """
         self.model = model
         self.temperature = temperature
         self.analysis_cache = {}
+        # The LLM only needs representative failures, not every node id
+        self.max_failures_in_prompt = 50
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl = cache_ttl_days * 86400
 
     def analyze_test_results(self, test_results: Dict[str, Any],
                            project_name: str) -> Dict[str, Any]:
@@ -73,20 +220,91 @@ class LLMTestAnalyzer:
 
         # Call LLM with structured format
         try:
-            response = call_llm(
-                prompt=prompt,
-                model=self.model,
-                temperature=self.temperature,
-                response_format="json"
-            )
-
-            analysis = json.loads(response)
+            analysis = self._call_llm_json(prompt, self.temperature, _json_schema_format(TestAnalysis))
             self.analysis_cache[project_name] = analysis
             return analysis
 
         except Exception as e:
             return {"error": f"LLM analysis failed: {str(e)}"}
 
+    async def abatch_analyze(self, items: List[Tuple[Dict[str, Any], str]],
+                             max_concurrency: Optional[int] = 8) -> List[Dict[str, Any]]:
+        """
+        Analyze several (test_results, project_name) pairs concurrently.
+
+        Each blocking LLM call runs in a worker thread; at most max_concurrency
+        are in flight at once (unbounded when None) to respect provider rate
+        limits. Results are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def _analyze_one(test_results: Dict[str, Any], project_name: str) -> Dict[str, Any]:
+            if semaphore is None:
+                return await asyncio.to_thread(self.analyze_test_results, test_results, project_name)
+            async with semaphore:
+                return await asyncio.to_thread(self.analyze_test_results, test_results, project_name)
+
+        return await asyncio.gather(*(_analyze_one(r, p) for r, p in items))
+
+    def analyze_test_results_batch(self, items: List[Tuple[Dict[str, Any], str]],
+                                   max_concurrency: Optional[int] = 8) -> List[Dict[str, Any]]:
+        """Synchronous wrapper around abatch_analyze."""
+        return asyncio.run(self.abatch_analyze(items, max_concurrency))
+
+    def _call_llm_json(self, prompt: str, temperature: float,
+                       response_format: Any = "json") -> Dict[str, Any]:
+        """Call the LLM for a JSON response, reusing cached deterministic answers."""
+        cache_file = None
+        if self.cache_dir is not None and temperature <= CACHEABLE_TEMPERATURE:
+            # The response format is part of the key so a schema change
+            # doesn't keep serving answers in the old shape
+            response_format_key = json.dumps(response_format, sort_keys=True)
+            key = hashlib.sha256(
+                f"{self.model}\0{temperature}\0{response_format_key}\0{prompt}".encode("utf-8")
+            ).hexdigest()
+            cache_file = self.cache_dir / f"{key}.json"
+            cached = self._load_cached_response(cache_file)
+            if cached is not None:
+                return cached
+
+        response = call_llm(
+            prompt=prompt,
+            model=self.model,
+            temperature=temperature,
+            response_format=response_format
+        )
+        result = _json_loads(response)
+
+        # Only responses that parsed are worth keeping
+        if cache_file is not None:
+            self._store_cached_response(cache_file, response)
+        return result
+
+    def _load_cached_response(self, cache_file: Path) -> Optional[Dict[str, Any]]:
+        """Load a cached response, or None if missing, expired or unreadable."""
+        try:
+            if time.time() - cache_file.stat().st_mtime > self.cache_ttl:
+                return None
+            return _json_loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached_response(self, cache_file: Path, response: str) -> None:
+        """Write a response to the cache; failures only cost a future LLM call."""
+        # Write then rename so concurrent runs never see a partial entry
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(response, encoding="utf-8")
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+
+    def _prompt_failures(self, test_results: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+        """Failed tests to show in a prompt (capped) and the total number failed."""
+        failed = _failed_tests(test_results)
+        return failed[:self.max_failures_in_prompt], len(failed)
+
     def _create_analysis_prompt(self, test_results: Dict[str, Any],
                                project_name: str) -> str:
         """Create structured prompt for LLM analysis."""
@@ -98,69 +316,27 @@ class LLMTestAnalyzer:
         skipped_tests = test_results.get("skipped", 0)
 
         # Get failed test details
-        failed_test_details = []
-        for test in test_results.get("tests", []):
-            if test.get("outcome") == "failed":
-                failed_test_details.append({
-                    "name": test.get("nodeid", "unknown"),
-                    "error": test.get("error", "No error message")[:200]
-                })
-
-        prompt = f"""
-You are a test result analyzer. Your job is to provide FACTUAL analysis of test results.
-Never claim tests are passing if they are not. Always base your analysis on the actual data.
-
-Project: {project_name}
-Test Results Summary:
-- Total Tests: {total_tests}
-- Passed: {passed_tests}
-- Failed: {failed_tests}
-- Skipped: {skipped_tests}
-- Success Rate: {(passed_tests/total_tests*100) if total_tests > 0 else 0:.1f}%
-
-Failed Tests:
-{json.dumps(failed_test_details, indent=2)}
-
-Analyze these results and provide a JSON response with the following structure:
-{{
-    "summary": {{
-        "overall_status": "passing|failing|unstable",
-        "confidence_level": "high|medium|low",
-        "actual_pass_rate": <number>,
-        "requires_immediate_action": <boolean>
-    }},
-    "failed_test_analysis": [
-        {{
-            "test_name": "<test name>",
-            "failure_category": "assertion|import|timeout|other",
-            "likely_cause": "<brief explanation>",
-            "suggested_fix": "<actionable suggestion>"
-        }}
-    ],
-    "risk_assessment": {{
-        "deployment_ready": <boolean>,
-        "critical_failures": <number>,
-        "blocking_issues": ["<issue1>", "<issue2>"]
-    }},
-    "recommendations": [
-        {{
-            "priority": "high|medium|low",
-            "action": "<specific action to take>",
-            "reason": "<why this is important>"
-        }}
-    ],
-    "hallucination_check": {{
-        "stated_facts": ["<fact1>", "<fact2>"],
-        "data_verification": {{
-            "all_facts_verified": <boolean>,
-            "unverified_claims": []
-        }}
-    }}
-}}
-
-IMPORTANT: Base ALL conclusions strictly on the provided data. Do not make assumptions.
-"""
-        return prompt
+        shown_failures, total_failures = self._prompt_failures(test_results)
+        failed_test_details = [
+            {
+                "name": test.get("nodeid", "unknown"),
+                "error": _truncate_error(test.get("error"))
+            }
+            for test in shown_failures
+        ]
+        if total_failures > len(shown_failures):
+            failed_test_details.append(f"... and {total_failures - len(shown_failures)} more")
+
+        return _ANALYSIS_PROMPT.substitute(
+            project=project_name,
+            total=total_tests,
+            passed=passed_tests,
+            failed=failed_tests,
+            skipped=skipped_tests,
+            success_rate=f"{(passed_tests/total_tests*100) if total_tests > 0 else 0:.1f}",
+            # Compact separators keep the prompt (and its token count) small
+            failed_tests_json=json.dumps(failed_test_details, separators=(",", ":"))
+        )
 
     def verify_agent_claims(self, agent_output: str,
                           actual_results: Dict[str, Any]) -> Dict[str, Any]:
@@ -172,6 +348,11 @@ IMPORTANT: Base ALL conclusions strictly on the provided data. Do not make assum
         if not call_llm:
             return {"error": "LLM module not available"}
 
+        shown_failures, total_failures = self._prompt_failures(actual_results)
+        failed_ids = [t.get('nodeid', 'unknown') for t in shown_failures]
+        if total_failures > len(shown_failures):
+            failed_ids.append(f"... and {total_failures - len(shown_failures)} more")
+
         verification_prompt = f"""
 You are a fact-checker for test result claims. Your job is to verify claims against actual data.
 
@@ -184,35 +365,18 @@ ACTUAL TEST DATA:
 - Failed: {actual_results.get('failed', 0)}
 - Success Rate: {actual_results.get('success_rate', 0):.1f}%
 
-Failed Tests: {[t['nodeid'] for t in actual_results.get('tests', []) if t.get('outcome') == 'failed']}
-
-Analyze the agent's claims and provide a JSON response:
-{{
-    "verification_result": {{
-        "claims_accurate": <boolean>,
-        "hallucinations_detected": <boolean>,
-        "incorrect_claims": [
-            {{
-                "claim": "<what agent claimed>",
-                "reality": "<what actually happened>",
-                "severity": "critical|major|minor"
-            }}
-        ],
-        "verification_confidence": <0-100>
-    }},
-    "corrected_summary": "<accurate summary of actual test results>"
-}}
+Failed Tests: {failed_ids}
+
+Analyze the agent's claims: list every claim that contradicts the data with
+what actually happened and its severity, give your verification confidence
+(0-100), and write an accurate summary of the actual test results. Respond with
+JSON matching the provided schema.
 """
 
         try:
-            response = call_llm(
-                prompt=verification_prompt,
-                model=self.model,
-                temperature=0.0,  # Zero temperature for maximum accuracy
-                response_format="json"
-            )
-
-            return json.loads(response)
+            # Zero temperature for maximum accuracy
+            return self._call_llm_json(verification_prompt, 0.0,
+                                       _json_schema_format(ClaimVerification))
 
         except Exception as e:
             return {"error": f"Verification failed: {str(e)}"}
@@ -280,15 +444,16 @@ Failed Tests List:
 """
 
         # Add each failed test explicitly
-        for test in test_results.get("tests", []):
-            if test.get("outcome") == "failed":
-                summary += f"- {test.get('nodeid', 'unknown')}: FAILED\n"
-
-        summary += """
+        summary_parts = [summary]
+        summary_parts.extend(
+            f"- {test.get('nodeid', 'unknown')}: FAILED\n"
+            for test in _failed_tests(test_results)
+        )
+        summary_parts.append("""
 ==============================================================
 Any claim that contradicts these facts is a hallucination.
-"""
-        return summary
+""")
+        return "".join(summary_parts)
 
     def create_structured_report_for_llm(self, test_results: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -309,9 +474,7 @@ Any claim that contradicts these facts is a hallucination.
                     "failure_rate_percent": round((test_results.get("failed", 0) / test_results.get("total", 1)) * 100, 2)
                 },
                 "failed_test_names": [
-                    t.get("nodeid", "unknown")
-                    for t in test_results.get("tests", [])
-                    if t.get("outcome") == "failed"
+                    t.get("nodeid", "unknown") for t in _failed_tests(test_results)
                 ],
                 "deployment_status": "BLOCKED" if test_results.get("failed", 0) > 0 else "READY"
             },
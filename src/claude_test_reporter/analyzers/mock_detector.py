@@ -1,38 +1,124 @@
-
 """
 Module: mock_detector.py
 Description: Detects inappropriate mock usage in test files, especially in integration tests
 
-"""
-"""
-
 External Dependencies:
 - ast: https://docs.python.org/3/library/ast.html
-- re: https://docs.python.org/3/library/re.html
-
-Sample Input:
->>> test_content = '''
-... from unittest.mock import patch
-... def test_integration():
-...     with patch('module.function'):
-...         pass
-... '''
-
-Expected Output:
->>> detector = MockDetector()
->>> result = detector.analyze_test_content(test_content, 'test_integration.py')
->>> print(result)
-{'has_mocks': True, 'mock_score': 0.8, 'violations': ['Mock usage in integration test']}
 
 Example Usage:
+>>> test_content = "from unittest.mock import patch\\n"
 >>> detector = MockDetector()
->>> issues = detector.scan_test_file('/path/to/test_integration.py')
+>>> result = detector.analyze_test_content(test_content, 'test_integration.py')
+>>> result['has_mocks'], result['violations']
+(True, ['Mock usage detected in integration test'])
 """
 
 import ast
+import hashlib
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+# Callables whose calls count as mock usage
+MOCK_FACTORIES = frozenset({
+    'Mock', 'MagicMock', 'AsyncMock', 'NonCallableMock', 'NonCallableMagicMock',
+    'PropertyMock', 'create_autospec', 'patch',
+})
+
+# Modules whose import counts as mock usage (matched exactly or as a dotted
+# prefix, so multipledispatch or mockingbird don't count)
+MOCK_MODULES = ('unittest.mock', 'mock', 'pytest_mock')
+
+
+def _is_mock_module(name: str) -> bool:
+    """Whether an imported module is a mock library or one of its submodules."""
+    return any(name == module or name.startswith(module + '.') for module in MOCK_MODULES)
+
+
+def _iter_test_files(directory: str) -> Iterator[str]:
+    """Yield test_*.py paths under a directory, like Path.rglob but without a Path per entry.
+
+    Order matches rglob: a directory's matches first, then its subdirectories
+    (not following symlinks).
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        # Unreadable, vanished mid-walk, symlink loop, ...: skip just this directory
+        return
+    subdirs = []
+    for entry in entries:
+        name = entry.name
+        if name.startswith("test_") and name.endswith(".py"):
+            yield entry.path
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+        except OSError:
+            continue
+    for subdir in subdirs:
+        yield from _iter_test_files(subdir)
+
+
+def _asserts_called_without_args(content: str) -> bool:
+    """Whether some line asserts a call ('assert ... called') but none checks its arguments.
+
+    Line-wise equivalent of matching assert.*[Cc]alled without any
+    assert.*[Cc]alled.*with, using only substring searches.
+    """
+    found_called = False
+    start = content.find('assert')
+    while start != -1:
+        end = content.find('\n', start)
+        if end == -1:
+            end = len(content)
+        # 'called' or 'Called' after the line's first assert
+        called = content.find('alled', start + 7, end)
+        while called != -1 and content[called - 1] not in 'cC':
+            called = content.find('alled', called + 1, end)
+        if called != -1:
+            if content.find('with', called + 5, end) != -1:
+                return False
+            found_called = True
+        start = content.find('assert', end)
+    return found_called
+
+
+# Number of analyzed file contents remembered per detector
+CONTENT_CACHE_SIZE = 256
+
+# Below this many test files scan_project stays in-process
+PARALLEL_MIN_FILES = 8
+
+_worker_detector = None
+
+_visitor_local = threading.local()
+
+
+def _thread_visitor() -> "MockVisitor":
+    """This thread's MockVisitor, reset for a new file."""
+    visitor = getattr(_visitor_local, 'visitor', None)
+    if visitor is None:
+        visitor = _visitor_local.visitor = MockVisitor()
+    else:
+        visitor.reset()
+    return visitor
+
+
+def _init_worker(detector: "MockDetector") -> None:
+    """Install the detector for this worker process (pickled once per worker)."""
+    global _worker_detector
+    _worker_detector = detector
+
+
+def _scan_file_worker(file_path: str) -> Dict[str, Any]:
+    """Scan one test file in a worker process."""
+    return _worker_detector.scan_test_file(file_path)
 
 
 class MockDetector:
@@ -49,6 +135,11 @@ class MockDetector:
             r'create_autospec\s*\(',
             r'patch\.object\s*\(',
         ]
+        # Compiled once; the combined pattern rules out mock-free files in one scan
+        self._mock_res = [re.compile(p, re.IGNORECASE) for p in self.mock_patterns]
+        self._any_mock_re = re.compile(
+            "|".join(f"(?:{p})" for p in self.mock_patterns), re.IGNORECASE
+        )
 
         self.integration_indicators = [
             'integration',
@@ -58,6 +149,22 @@ class MockDetector:
             'functional'
         ]
 
+        # LRU of analysis results for identical file contents (templated or
+        # duplicated tests), keyed by content digest
+        self._content_cache: "OrderedDict[Tuple[bytes, bool, bool], Dict[str, Any]]" = OrderedDict()
+        self._content_cache_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks can't be pickled; worker processes start with an empty cache
+        state = self.__dict__.copy()
+        del state['_content_cache_lock']
+        state['_content_cache'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._content_cache_lock = threading.Lock()
+
     def scan_test_file(self, file_path: str) -> Dict[str, Any]:
         """Scan a test file for mock usage patterns."""
         file_path = Path(file_path)
@@ -65,15 +172,70 @@ class MockDetector:
             return {"error": f"File not found: {file_path}"}
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            return self.analyze_test_content(content, file_path.name)
+            with open(file_path, 'rb') as f:
+                data = f.read()
+
+            # Grep before parse: without a mock/patch token the AST pass has
+            # nothing to find, so only the text checks need to run. This only
+            # gates the parse (dispatch passes too); MockVisitor decides what
+            # counts as a mock
+            lowered = data.lower()
+            parse_ast = b'mock' in lowered or b'patch' in lowered
+
+            content = data.decode('utf-8')
+            line_count = None
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            elif parse_ast:
+                # Only files with mock tokens need a line count (for the density);
+                # counting the raw bytes spares a pass over the decoded text
+                line_count = data.count(b'\n')
+
+            return self.analyze_test_content(content, file_path.name, parse_ast=parse_ast,
+                                             line_count=line_count)
         except Exception as e:
             return {"error": f"Failed to analyze {file_path}: {str(e)}"}
 
-    def analyze_test_content(self, content: str, filename: str) -> Dict[str, Any]:
-        """Analyze test content for mock usage."""
+    def analyze_test_content(self, content: str, filename: str, parse_ast: Optional[bool] = None,
+                             line_count: Optional[int] = None) -> Dict[str, Any]:
+        """Analyze test content for mock usage.
+
+        parse_ast=False skips the AST pass; by default it only runs when the
+        content mentions mock or patch. line_count, when the caller already
+        knows it, is the number of newlines in content.
+        """
+        if parse_ast is None:
+            lowered = content.lower()
+            parse_ast = 'mock' in lowered or 'patch' in lowered
+
+        # Only the integration check looks at the filename, so identical
+        # contents can share a result when that check agrees
+        filename_lower = filename.lower()
+        key = (
+            hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),
+            parse_ast,
+            any(indicator in filename_lower for indicator in self.integration_indicators),
+        )
+        with self._content_cache_lock:
+            cached = self._content_cache.get(key)
+            if cached is not None:
+                self._content_cache.move_to_end(key)
+
+        if cached is None:
+            cached = self._analyze_content(content, filename, parse_ast, line_count)
+            with self._content_cache_lock:
+                self._content_cache[key] = cached
+                if len(self._content_cache) > CONTENT_CACHE_SIZE:
+                    self._content_cache.popitem(last=False)
+
+        # Hand out copies so callers can't alter the cached entry
+        result = {k: v.copy() if isinstance(v, list) else v for k, v in cached.items()}
+        result["filename"] = filename
+        return result
+
+    def _analyze_content(self, content: str, filename: str, parse_ast: bool,
+                         line_count: Optional[int] = None) -> Dict[str, Any]:
+        """Uncached body of analyze_test_content."""
         result = {
             "filename": filename,
             "has_mocks": False,
@@ -85,32 +247,31 @@ class MockDetector:
             "suspicious_patterns": []
         }
 
-        # Check for mock imports and usage
-        mock_matches = []
-        for pattern in self.mock_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                mock_matches.extend(matches)
-                result["has_mocks"] = True
-
-        result["mock_count"] = len(mock_matches)
-
-        # Analyze AST for more detailed mock usage
+        # Count mock imports and calls from the AST; fall back to the regex
+        # patterns only when the file does not parse
         try:
-            tree = ast.parse(content)
-            mock_visitor = MockVisitor()
-            mock_visitor.visit(tree)
+            # ast.parse minus its wrapper; optimize stays at the default since
+            # an optimized tree may drop asserts, which hold mock calls
+            tree = compile(content, filename, 'exec', ast.PyCF_ONLY_AST,
+                           dont_inherit=True) if parse_ast else None
+        except SyntaxError:
+            result["ast_error"] = "Failed to parse Python AST"
+            result["mock_count"] = self._regex_mock_count(content)
+        else:
+            mock_visitor = _thread_visitor()
+            if tree is not None:
+                mock_visitor.visit(tree)
 
+            result["mock_count"] = mock_visitor.mock_count
             result["mock_types"] = mock_visitor.mock_types
             result["patch_targets"] = mock_visitor.patch_targets
             result["mock_in_test_count"] = mock_visitor.mock_in_test_count
 
-        except SyntaxError:
-            result["ast_error"] = "Failed to parse Python AST"
+        result["has_mocks"] = result["mock_count"] > 0
 
         # Calculate mock score
         if result["has_mocks"]:
-            lines = content.count('\n')
+            lines = line_count if line_count is not None else content.count('\n')
             mock_density = min(result["mock_count"] / max(lines / 10, 1), 1.0)
             result["mock_score"] = mock_density
 
@@ -126,11 +287,21 @@ class MockDetector:
         if "mock.ANY" in content or "ANY" in content:
             result["suspicious_patterns"].append("Using mock.ANY to bypass assertions")
 
-        if re.search(r'assert.*[Cc]alled', content) and not re.search(r'assert.*[Cc]alled.*with', content):
+        if _asserts_called_without_args(content):
             result["suspicious_patterns"].append("Asserting called without checking arguments")
 
         return result
 
+    def _regex_mock_count(self, content: str) -> int:
+        """Count mock pattern matches in source that could not be parsed."""
+        # Patterns can overlap (e.g. MagicMock( also matches Mock(), so each is
+        # still counted separately once the combined scan finds anything
+        mock_count = 0
+        if self._any_mock_re.search(content):
+            for mock_re in self._mock_res:
+                mock_count += len(mock_re.findall(content))
+        return mock_count
+
     def _is_integration_test(self, filename: str, content: str) -> bool:
         """Determine if this is an integration test."""
         filename_lower = filename.lower()
@@ -141,8 +312,12 @@ class MockDetector:
                 return True
         return False
 
-    def scan_project(self, project_path: str) -> Dict[str, Any]:
-        """Scan all test files in a project."""
+    def scan_project(self, project_path: str, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Scan all test files in a project.
+
+        Files are scanned serially unless max_workers asks for a process
+        pool (used only for at least PARALLEL_MIN_FILES files).
+        """
         project_path = Path(project_path)
         test_dirs = [project_path / "tests", project_path / "test"]
 
@@ -157,24 +332,21 @@ class MockDetector:
             "file_results": {}
         }
 
-        for test_dir in test_dirs:
-            if not test_dir.exists():
-                continue
-
-            for test_file in test_dir.rglob("test_*.py"):
-                results["total_test_files"] += 1
-
-                file_result = self.scan_test_file(str(test_file))
-                results["file_results"][str(test_file)] = file_result
-
-                if file_result.get("has_mocks"):
-                    results["files_with_mocks"] += 1
-                    results["total_mock_count"] += file_result.get("mock_count", 0)
-
-                    if file_result.get("is_integration_test"):
-                        results["integration_tests_with_mocks"] += 1
+        test_files = [
+            test_file
+            for test_dir in test_dirs if test_dir.exists()
+            for test_file in _iter_test_files(str(test_dir))
+        ]
 
-                results["violations"].extend(file_result.get("violations", []))
+        n_workers = max_workers or 1
+        if n_workers == 1 or len(test_files) < PARALLEL_MIN_FILES:
+            self._merge_file_results(results, test_files, map(self.scan_test_file, test_files))
+        else:
+            chunksize = max(1, len(test_files) // (4 * n_workers))
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                file_results = executor.map(_scan_file_worker, test_files, chunksize=chunksize)
+                self._merge_file_results(results, test_files, file_results)
 
         # Calculate average mock score
         if results["total_test_files"] > 0:
@@ -186,14 +358,39 @@ class MockDetector:
 
         return results
 
+    @staticmethod
+    def _merge_file_results(results: Dict[str, Any], test_files: List[str],
+                            file_results: Iterable[Dict[str, Any]]):
+        """Fold per-file scan results into the project totals."""
+        for test_file, file_result in zip(test_files, file_results):
+            results["total_test_files"] += 1
+            results["file_results"][test_file] = file_result
+
+            if file_result.get("has_mocks"):
+                results["files_with_mocks"] += 1
+                results["total_mock_count"] += file_result.get("mock_count", 0)
+
+                if file_result.get("is_integration_test"):
+                    results["integration_tests_with_mocks"] += 1
+
+            results["violations"].extend(file_result.get("violations", []))
+
 
 class MockVisitor(ast.NodeVisitor):
     """AST visitor to find mock usage patterns."""
 
+    __slots__ = ('mock_types', 'patch_targets', 'mock_in_test_count', 'mock_count',
+                 'in_test_function')
+
     def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear the findings so the visitor can be reused for another file."""
         self.mock_types = []
         self.patch_targets = []
         self.mock_in_test_count = 0
+        self.mock_count = 0
         self.in_test_function = False
 
     def visit_FunctionDef(self, node):
@@ -210,17 +407,31 @@ class MockVisitor(ast.NodeVisitor):
         for alias in node.names:
             if 'mock' in alias.name.lower() or 'patch' in alias.name.lower():
                 self.mock_types.append(f"import {alias.name}")
+            if _is_mock_module(alias.name):
+                self.mock_count += 1
         self.generic_visit(node)
 
     def visit_ImportFrom(self, node):
         """Track mock imports."""
-        if node.module and 'mock' in node.module.lower():
+        module = node.module or ''
+        # from unittest import mock
+        imports_mock = module == 'unittest' and any(alias.name == 'mock' for alias in node.names)
+        if 'mock' in module.lower():
             for alias in node.names:
-                self.mock_types.append(f"from {node.module} import {alias.name}")
+                self.mock_types.append(f"from {module} import {alias.name}")
+        elif imports_mock:
+            self.mock_types.append("from unittest import mock")
+
+        # Relative imports name local modules, never the mock libraries
+        if node.level == 0 and (imports_mock or _is_mock_module(module)):
+            self.mock_count += 1
         self.generic_visit(node)
 
     def visit_Call(self, node):
         """Track mock calls."""
+        if self._is_mock_constructor(node.func):
+            self.mock_count += 1
+
         if self.in_test_function:
             call_name = self._get_call_name(node)
             if call_name and any(mock in call_name.lower() for mock in ['mock', 'patch']):
@@ -229,11 +440,32 @@ class MockVisitor(ast.NodeVisitor):
         # Check for patch decorators
         if isinstance(node.func, ast.Attribute) and node.func.attr == 'patch':
             if node.args:
-                target = ast.unparse(node.args[0]) if hasattr(ast, 'unparse') else str(node.args[0])
+                # Patch targets are almost always string literals or names
+                arg = node.args[0]
+                if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                    target = repr(arg.value)
+                elif isinstance(arg, ast.Name):
+                    target = arg.id
+                else:
+                    target = ast.unparse(arg) if hasattr(ast, 'unparse') else str(arg)
                 self.patch_targets.append(target)
 
         self.generic_visit(node)
 
+    @staticmethod
+    def _is_mock_constructor(func) -> bool:
+        """Whether a call creates a mock or patch (Mock(), patch.object(), ...)."""
+        if isinstance(func, ast.Name):
+            return func.id in MOCK_FACTORIES
+        if isinstance(func, ast.Attribute):
+            if func.attr in MOCK_FACTORIES:
+                return True
+            # patch.object / patch.dict / patch.multiple
+            owner = func.value
+            owner_name = owner.id if isinstance(owner, ast.Name) else getattr(owner, 'attr', None)
+            return owner_name == 'patch'
+        return False
+
     def _get_call_name(self, node):
         """Get the name of a function call."""
         if isinstance(node.func, ast.Name):
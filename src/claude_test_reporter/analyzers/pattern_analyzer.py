@@ -9,7 +9,7 @@ Description: Analyzes deception patterns across multiple projects to identify sy
 External Dependencies:
 - collections: https://docs.python.org/3/library/collections.html
 - difflib: https://docs.python.org/3/library/difflib.html
-- statistics: https://docs.python.org/3/library/statistics.html
+- heapq: https://docs.python.org/3/library/heapq.html
 
 Sample Input:
 >>> analyzer = DeceptionPatternAnalyzer()
@@ -29,15 +29,49 @@ Example Usage:
 ...     print(f"WARNING: High deception score: {patterns['deception_score']:.1%}")
 """
 
-from collections import defaultdict, Counter
+import heapq
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
 from difflib import SequenceMatcher
-import statistics
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Set, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 import json
 
+# Volatile parts of error messages (file paths, line numbers, memory
+# addresses, timestamps), replaced in one scan before comparing across
+# projects. A timestamp whose last 0 starts an address is left to the
+# address, as if the four had been substituted one after another.
+_RE_VOLATILE = re.compile(
+    r'(?P<file>[/\\][\w/\\.-]+\.(?:py|js|ts))'
+    r'|(?P<line>line \d+)'
+    r'|(?P<addr>0x[0-9a-fA-F]+)'
+    r'|(?P<time>\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?!(?<=0)x[0-9a-fA-F]))'
+)
+_VOLATILE_REPLACEMENTS = {
+    'file': '<FILE>',
+    'line': 'line <NUM>',
+    'addr': '<ADDR>',
+    'time': '<TIME>',
+}
+
+
+@lru_cache(maxsize=4096)
+def _normalize_error(error: str) -> str:
+    """Normalize an error message for comparison (memoized; errors recur across projects)."""
+    # Remove file paths, line numbers, memory addresses and timestamps
+    error = _RE_VOLATILE.sub(lambda m: _VOLATILE_REPLACEMENTS[m.lastgroup], error)
+
+    return error.strip().lower()
+
+
+def _mean(values) -> float:
+    """Float mean, 0.0 when empty (statistics.mean is far slower and exact)."""
+    values = list(values)
+    return sum(values) / len(values) if values else 0.0
+
 
 class DeceptionPatternAnalyzer:
     """Analyzes patterns of deception across projects."""
@@ -66,26 +100,24 @@ class DeceptionPatternAnalyzer:
             "high_risk_projects": []
         }
 
-        # Analyze each pattern type
-        patterns = {
-            "instant_test_pattern": self._analyze_instant_test_pattern(project_results),
-            "mock_pattern": self._analyze_mock_pattern(project_results),
-            "error_pattern": self._analyze_error_patterns(project_results),
-            "perfect_test_pattern": self._analyze_perfect_test_pattern(project_results),
-            "integration_pattern": self._analyze_integration_pattern(project_results)
-        }
-
-        # Calculate deception scores per project
-        for project in project_results:
-            project_name = project.get('project', 'unknown')
-            score = self._calculate_project_deception_score(project, patterns)
+        # Analyze each pattern type, collecting the per-project score inputs
+        features: List[Dict[str, Any]] = []
+        patterns = self._analyze_patterns(project_results, features)
+
+        # Calculate deception scores per project, with the weights looked up once
+        weights = self._score_weights()
+        instant_details = patterns["instant_test_pattern"]["details"]
+        instant_violations = set(patterns["instant_test_pattern"]["threshold_violations"])
+        for project in features:
+            project_name = project["project"]
+            score = self._calculate_project_deception_score(project, instant_details, weights)
             analysis["deception_scores"][project_name] = score
 
             if score > 0.7:
                 analysis["high_risk_projects"].append({
                     "project": project_name,
                     "score": score,
-                    "main_issues": self._identify_main_issues(project, patterns)
+                    "main_issues": self._identify_main_issues(project, instant_violations)
                 })
 
         # Find repeated patterns
@@ -93,9 +125,7 @@ class DeceptionPatternAnalyzer:
 
         # Calculate overall deception score
         if analysis["deception_scores"]:
-            analysis["overall_deception_score"] = statistics.mean(
-                analysis["deception_scores"].values()
-            )
+            analysis["overall_deception_score"] = _mean(analysis["deception_scores"].values())
 
         # Identify found patterns
         for pattern_name, pattern_data in patterns.items():
@@ -107,145 +137,77 @@ class DeceptionPatternAnalyzer:
 
         return analysis
 
-    def _analyze_instant_test_pattern(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze pattern of tests completing instantly."""
+    def _analyze_patterns(self, results: List[Dict[str, Any]],
+                          features: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Analyze every pattern type in a single pass over the project results.
+
+        When features is given, each project's scoring inputs (name, mock
+        score, perfect / no-integration flags) are appended to it in order.
+        """
+        # Plain scalar/dict accumulators: project lists are tens of entries, far
+        # too few for array conversion (NumPy) to pay for itself
+
+        # Instant tests
         instant_tests_by_project = {}
         total_instant = 0
-        total_tests = 0
+        instant_total_tests = 0
+        # Mocking
+        mock_scores = {}
+        integration_with_mocks = 0
+        # Errors (plain dict: get/append avoids defaultdict's factory call and
+        # the throwaway list setdefault would build for every repeat)
+        error_messages: Dict[str, List[str]] = {}
+        # Perfect results
+        perfect_projects = []
+        failure_rates = []
+        # Integration tests
+        missing_integration = []
+        poor_integration = []
 
         for project in results:
+            # Each field is read once; a missing total counts as 1 test
             project_name = project.get('project', 'unknown')
-            instant = project.get('instant_tests', 0)
             total = project.get('total_tests', 1)
+            instant = project.get('instant_tests', 0)
+            integration_tests = project.get('integration_tests', 0)
 
+            # Tests completing instantly
             instant_tests_by_project[project_name] = {
                 "count": instant,
                 "ratio": instant / max(total, 1)
             }
-
             total_instant += instant
-            total_tests += total
-
-        pattern = {
-            "type": "instant_tests",
-            "projects_affected": len([p for p in instant_tests_by_project.values()
-                                    if p["count"] > 0]),
-            "severity": total_instant / max(total_tests, 1),
-            "details": instant_tests_by_project,
-            "threshold_violations": [
-                p for p, data in instant_tests_by_project.items()
-                if data["ratio"] > 0.3
-            ]
-        }
-
-        return pattern
-
-    def _analyze_mock_pattern(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze pattern of excessive mocking."""
-        mock_scores = {}
-        integration_with_mocks = 0
+            instant_total_tests += total
 
-        for project in results:
-            project_name = project.get('project', 'unknown')
+            # Excessive mocking, including mocks in integration tests
             mock_score = project.get('mock_score', 0)
             mock_scores[project_name] = mock_score
-
-            # Check if integration tests use mocks
             if project.get('integration_tests_with_mocks', 0) > 0:
                 integration_with_mocks += 1
 
-        pattern = {
-            "type": "excessive_mocking",
-            "projects_affected": len([s for s in mock_scores.values() if s > 0.5]),
-            "severity": statistics.mean(mock_scores.values()) if mock_scores else 0,
-            "integration_tests_mocked": integration_with_mocks,
-            "worst_offenders": sorted(
-                [(p, s) for p, s in mock_scores.items() if s > 0.7],
-                key=lambda x: x[1],
-                reverse=True
-            )[:5]
-        }
-
-        return pattern
-
-    def _analyze_error_patterns(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Find identical error messages across projects."""
-        error_messages = defaultdict(list)
-
-        for project in results:
-            project_name = project.get('project', 'unknown')
-            errors = project.get('error_messages', [])
-
-            for error in errors:
-                # Normalize error message
-                normalized = self._normalize_error_message(error)
-                error_messages[normalized].append(project_name)
-
-        # Find errors that appear in multiple projects
-        repeated_errors = {
-            error: projects
-            for error, projects in error_messages.items()
-            if len(projects) > 1
-        }
-
-        pattern = {
-            "type": "identical_errors",
-            "repeated_count": len(repeated_errors),
-            "severity": len(repeated_errors) / max(len(error_messages), 1),
-            "examples": list(repeated_errors.items())[:5],
-            "most_common": Counter(
-                [error for error, projects in repeated_errors.items()]
-            ).most_common(3)
-        }
-
-        return pattern
-
-    def _analyze_perfect_test_pattern(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze suspiciously perfect test results."""
-        perfect_projects = []
-        failure_rates = []
-
-        for project in results:
-            project_name = project.get('project', 'unknown')
-            total = project.get('total_tests', 0)
-            failed = project.get('failed_tests', 0)
-
-            if total > 10:  # Only consider projects with substantial tests
-                failure_rate = failed / total
+            # Identical errors; one lookup on the common repeat path
+            for error in project.get('error_messages', []):
+                normalized = _normalize_error(error)
+                projects = error_messages.get(normalized)
+                if projects is None:
+                    error_messages[normalized] = [project_name]
+                else:
+                    projects.append(project_name)
+
+            # Suspiciously perfect results (only projects with substantial tests)
+            perfect = False
+            if total > 10:
+                failure_rate = project.get('failed_tests', 0) / total
                 failure_rates.append(failure_rate)
-
-                if failure_rate == 0:
+                perfect = failure_rate == 0
+                if perfect:
                     perfect_projects.append({
                         "project": project_name,
                         "tests": total
                     })
 
-        # Calculate how unusual perfect tests are
-        avg_failure_rate = statistics.mean(failure_rates) if failure_rates else 0.1
-
-        pattern = {
-            "type": "no_failures",
-            "perfect_projects": len(perfect_projects),
-            "severity": len(perfect_projects) / max(len(results), 1),
-            "average_failure_rate": avg_failure_rate,
-            "suspicious_projects": perfect_projects,
-            "statistical_anomaly": avg_failure_rate > 0.05 and len(perfect_projects) > 2
-        }
-
-        return pattern
-
-    def _analyze_integration_pattern(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze missing integration tests."""
-        missing_integration = []
-        poor_integration = []
-
-        for project in results:
-            project_name = project.get('project', 'unknown')
-            integration_tests = project.get('integration_tests', 0)
-            total_tests = project.get('total_tests', 1)
-
-            integration_ratio = integration_tests / total_tests
-
+            # Missing or sparse integration tests
+            integration_ratio = integration_tests / total
             if integration_tests == 0:
                 missing_integration.append(project_name)
             elif integration_ratio < 0.1:
@@ -254,63 +216,132 @@ class DeceptionPatternAnalyzer:
                     "ratio": integration_ratio
                 })
 
-        pattern = {
-            "type": "missing_integration",
-            "projects_without": missing_integration,
-            "projects_with_poor": poor_integration,
-            "severity": len(missing_integration) / max(len(results), 1),
-            "total_affected": len(missing_integration) + len(poor_integration)
+            if features is not None:
+                features.append({
+                    "project": project_name,
+                    "mock_score": mock_score,
+                    "perfect": perfect,
+                    "no_integration": integration_tests == 0,
+                })
+
+        # Find errors that appear in multiple projects
+        repeated_errors = {
+            error: projects
+            for error, projects in error_messages.items()
+            if len(projects) > 1
         }
 
-        return pattern
+        # Calculate how unusual perfect tests are
+        avg_failure_rate = _mean(failure_rates) if failure_rates else 0.1
+
+        return {
+            "instant_test_pattern": {
+                "type": "instant_tests",
+                "projects_affected": sum(1 for p in instant_tests_by_project.values()
+                                         if p["count"] > 0),
+                "severity": total_instant / max(instant_total_tests, 1),
+                "details": instant_tests_by_project,
+                "threshold_violations": [
+                    p for p, data in instant_tests_by_project.items()
+                    if data["ratio"] > 0.3
+                ]
+            },
+            "mock_pattern": {
+                "type": "excessive_mocking",
+                "projects_affected": sum(1 for s in mock_scores.values() if s > 0.5),
+                "severity": _mean(mock_scores.values()),
+                "integration_tests_mocked": integration_with_mocks,
+                "worst_offenders": heapq.nlargest(
+                    5, ((p, s) for p, s in mock_scores.items() if s > 0.7),
+                    key=lambda x: x[1]
+                )
+            },
+            "error_pattern": {
+                "type": "identical_errors",
+                "repeated_count": len(repeated_errors),
+                "severity": len(repeated_errors) / max(len(error_messages), 1),
+                "examples": list(islice(repeated_errors.items(), 5)),
+                # Errors shared by the most projects (counted per occurrence)
+                "most_common": heapq.nlargest(
+                    3, ((error, len(projects)) for error, projects in repeated_errors.items()),
+                    key=lambda x: x[1]
+                )
+            },
+            "perfect_test_pattern": {
+                "type": "no_failures",
+                "perfect_projects": len(perfect_projects),
+                "severity": len(perfect_projects) / max(len(results), 1),
+                "average_failure_rate": avg_failure_rate,
+                "suspicious_projects": perfect_projects,
+                "statistical_anomaly": avg_failure_rate > 0.05 and len(perfect_projects) > 2
+            },
+            "integration_pattern": {
+                "type": "missing_integration",
+                "projects_without": missing_integration,
+                "projects_with_poor": poor_integration,
+                "severity": len(missing_integration) / max(len(results), 1),
+                "total_affected": len(missing_integration) + len(poor_integration)
+            },
+        }
+
+    def _score_weights(self) -> Tuple[float, float, float, float]:
+        """Instant-test, mocking, no-failure and missing-integration weights."""
+        weights = self.deception_patterns
+        return (weights['instant_tests'], weights['excessive_mocking'],
+                weights['no_failures'], weights['missing_integration'])
 
     def _calculate_project_deception_score(self, project: Dict[str, Any],
-                                         patterns: Dict[str, Any]) -> float:
-        """Calculate deception score for a single project."""
+                                         instant_details: Dict[str, Dict[str, Any]],
+                                         weights: Optional[Tuple[float, float, float, float]] = None) -> float:
+        """Calculate deception score for a single project.
+
+        project holds the features collected by _analyze_patterns;
+        instant_details is the instant-test pattern's per-project details.
+        """
+        w_instant, w_mock, w_perfect, w_integration = weights or self._score_weights()
         score = 0.0
-        project_name = project.get('project', 'unknown')
 
         # Instant tests contribution
-        instant_pattern = patterns.get("instant_test_pattern", {})
-        if project_name in instant_pattern.get("details", {}):
-            ratio = instant_pattern["details"][project_name]["ratio"]
-            score += ratio * self.deception_patterns['instant_tests']
+        instant = instant_details.get(project["project"])
+        if instant is not None:
+            score += instant["ratio"] * w_instant
 
         # Mock score contribution
-        mock_score = project.get('mock_score', 0)
-        score += mock_score * self.deception_patterns['excessive_mocking']
+        score += project["mock_score"] * w_mock
 
         # Perfect tests contribution
-        if project.get('failed_tests', 0) == 0 and project.get('total_tests', 0) > 10:
-            score += self.deception_patterns['no_failures']
+        if project["perfect"]:
+            score += w_perfect
 
         # Missing integration contribution
-        if project.get('integration_tests', 0) == 0:
-            score += self.deception_patterns['missing_integration']
+        if project["no_integration"]:
+            score += w_integration
 
         return min(score, 1.0)  # Cap at 1.0
 
     def _identify_main_issues(self, project: Dict[str, Any],
-                            patterns: Dict[str, Any]) -> List[str]:
-        """Identify main deception issues for a project."""
+                            instant_violations: Set[str]) -> List[str]:
+        """Identify main deception issues for a project.
+
+        project holds the features collected by _analyze_patterns;
+        instant_violations holds the projects over the instant-test threshold.
+        """
         issues = []
-        project_name = project.get('project', 'unknown')
 
         # Check instant tests
-        instant_pattern = patterns.get("instant_test_pattern", {})
-        if project_name in instant_pattern.get("threshold_violations", []):
+        if project["project"] in instant_violations:
             issues.append("excessive_instant_tests")
 
         # Check mocking
-        if project.get('mock_score', 0) > 0.7:
+        if project["mock_score"] > 0.7:
             issues.append("excessive_mocking")
 
         # Check failures
-        if project.get('failed_tests', 0) == 0 and project.get('total_tests', 0) > 10:
+        if project["perfect"]:
             issues.append("suspiciously_perfect")
 
         # Check integration
-        if project.get('integration_tests', 0) == 0:
+        if project["no_integration"]:
             issues.append("no_integration_tests")
 
         return issues
@@ -350,16 +381,7 @@ class DeceptionPatternAnalyzer:
 
     def _normalize_error_message(self, error: str) -> str:
         """Normalize error message for comparison."""
-        # Remove file paths
-        error = re.sub(r'[/\\][\w/\\.-]+\.(py|js|ts)', '<FILE>', error)
-        # Remove line numbers
-        error = re.sub(r'line \d+', 'line <NUM>', error)
-        # Remove memory addresses
-        error = re.sub(r'0x[0-9a-fA-F]+', '<ADDR>', error)
-        # Remove timestamps
-        error = re.sub(r'\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}', '<TIME>', error)
-
-        return error.strip().lower()
+        return _normalize_error(error)
 
     def _generate_recommendations(self, analysis: Dict[str, Any],
                                 patterns: Dict[str, Any]) -> List[str]:
@@ -387,35 +409,57 @@ class DeceptionPatternAnalyzer:
             recommendations.append("Add deliberate failing tests (honeypots) to detect manipulation")
 
         # High-risk projects
-        if len(analysis["high_risk_projects"]) > 0:
-            projects = [p["project"] for p in analysis["high_risk_projects"]]
-            recommendations.append(f"Priority review needed for: {', '.join(projects)}")
+        if analysis["high_risk_projects"]:
+            projects = ', '.join(p["project"] for p in analysis["high_risk_projects"])
+            recommendations.append(f"Priority review needed for: {projects}")
 
         return recommendations
 
     def compare_code_similarity(self, file_pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
         """Compare code files for suspicious similarity."""
         similarities = []
+        threshold = self.similarity_threshold
+
+        # Each file is read (and its characters counted) once, however many
+        # pairs it is in; unreadable files are remembered as None
+        files: Dict[str, Optional[Tuple[str, Counter]]] = {}
+
+        def load(path: str) -> Optional[Tuple[str, Counter]]:
+            if path not in files:
+                try:
+                    with open(path, 'r') as f:
+                        content = f.read()
+                    files[path] = (content, Counter(content))
+                except (OSError, ValueError):
+                    files[path] = None
+            return files[path]
 
         for file1, file2 in file_pairs:
-            try:
-                with open(file1, 'r') as f1, open(file2, 'r') as f2:
-                    content1 = f1.read()
-                    content2 = f2.read()
-
-                # Calculate similarity
-                similarity = SequenceMatcher(None, content1, content2).ratio()
-
-                if similarity > self.similarity_threshold:
-                    similarities.append({
-                        "file1": file1,
-                        "file2": file2,
-                        "similarity": similarity,
-                        "likely_copied": True
-                    })
-
-            except Exception as e:
+            loaded1 = load(file1)
+            loaded2 = load(file2)
+            if loaded1 is None or loaded2 is None:
                 continue
+            content1, counts1 = loaded1
+            content2, counts2 = loaded2
+
+            # Calculate similarity; SequenceMatcher's length and character-count
+            # upper bounds (real_quick_ratio / quick_ratio, here from the cached
+            # counts) rule out most pairs before the O(n*m) ratio()
+            length = len(content1) + len(content2)
+            if length:
+                if 2.0 * min(len(content1), len(content2)) / length <= threshold:
+                    continue
+                if 2.0 * sum((counts1 & counts2).values()) / length <= threshold:
+                    continue
+            similarity = SequenceMatcher(None, content1, content2).ratio()
+
+            if similarity > threshold:
+                similarities.append({
+                    "file1": file1,
+                    "file2": file2,
+                    "similarity": similarity,
+                    "likely_copied": True
+                })
 
         return {
             "files_compared": len(file_pairs),
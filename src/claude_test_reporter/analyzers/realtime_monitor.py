@@ -8,8 +8,8 @@ Description: Real-time test execution monitor that actually runs tests and captu
 
 External Dependencies:
 - subprocess: https://docs.python.org/3/library/subprocess.html
-- threading: https://docs.python.org/3/library/threading.html
-- queue: https://docs.python.org/3/library/queue.html
+- selectors: https://docs.python.org/3/library/selectors.html
+- threading: https://docs.python.org/3/library/threading.html (Windows only)
 
 Sample Input:
 >>> monitor = RealTimeTestMonitor()
@@ -26,18 +26,154 @@ Example Usage:
 ...     print(f"WARNING: {results['instant_tests']} tests completed suspiciously fast!")
 """
 
+import codecs
+import io
+import locale
+import queue
+import selectors
+import shlex
 import subprocess
+import threading
 import time
 import json
 import re
-import threading
-import queue
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 import sys
 import os
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# pytest -v result lines and --durations lines, compiled at import so the
+# first line of output doesn't pay for it. They match like the lazy
+# (.*?)::(.*?)\s+ forms, but the path stops at the first '::' and whitespace
+# runs are only tried from their start, so non-matching lines fail in
+# linear time.
+_TEST_RE = re.compile(r'^((?:[^:]|:(?!:))*)::(.*?)(?<!\s)\s+(PASSED|FAILED|SKIPPED|ERROR)')
+_DURATION_RE = re.compile(r'^([\d.]+)s\s+(?!\s)((?:[^:]|:(?!:))*)::(.*)$')
+_IMPORT_ERROR_RE = re.compile(r'(ImportError|ModuleNotFoundError):(.*)$')
+
+# Output that suggests the tests exercise mocks
+_MOCK_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), description)
+    for pattern, description in (
+        (r'Mock.*called', "Mock object was called"),
+        (r'patch.*as.*mock', "Using patch decorator"),
+        (r'return_value\s*=', "Setting mock return value"),
+        (r'side_effect\s*=', "Setting mock side effect"),
+        (r'assert_called', "Asserting mock was called"),
+        (r'<MagicMock', "MagicMock object in output"),
+        (r'unittest\.mock', "unittest.mock import detected"),
+    )
+]
+# One scan rules out lines without any indicator; a line can report several,
+# so the individual patterns only run on lines that pass it
+_ANY_MOCK_RE = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern, _ in _MOCK_PATTERNS), re.IGNORECASE
+)
+
+# Every mock pattern needs one of these (casefolded) substrings; they avoid
+# the letters re.IGNORECASE matches beyond casefold (dotless i, long s)
+_MOCK_LITERALS = ('mock', 'patch', 'return_value', 'de_effect', 'called')
+
+# Single-pass literal matcher when pyahocorasick is installed
+_mock_literal_automaton = None
+if ahocorasick is not None:
+    _mock_literal_automaton = ahocorasick.Automaton()
+    for _literal in _MOCK_LITERALS:
+        _mock_literal_automaton.add_word(_literal, _literal)
+    _mock_literal_automaton.make_automaton()
+
+# Counts compare_with_reported checks, with the severity of a mismatch
+_COMPARE_FIELDS = (
+    ("total_tests", "high"),
+    ("passed_tests", "critical"),
+)
+
+
+def _may_contain_mock_output(text: str) -> bool:
+    """Cheap check that text could match any mock pattern at all."""
+    folded = text.casefold()
+    if _mock_literal_automaton is not None:
+        return next(_mock_literal_automaton.iter(folded), None) is not None
+    return any(literal in folded for literal in _MOCK_LITERALS)
+
+
+# How often the readers check whether the process has exited while its pipes
+# are quiet
+_EXIT_POLL_INTERVAL = 0.1
+
+
+def _read_chunks_selector(pipes, deadline: float,
+                          process: Optional[subprocess.Popen] = None) -> Iterator[Tuple[Any, bytes]]:
+    """Yield (pipe, chunk) as output arrives until the deadline; b'' marks a pipe's EOF.
+
+    Once process has exited, whatever is already readable is drained and
+    reading stops, even if a child it left behind still holds the pipes open.
+    """
+    with selectors.DefaultSelector() as selector:
+        for pipe in pipes:
+            selector.register(pipe, selectors.EVENT_READ)
+        exited = False
+        while selector.get_map() and time.time() < deadline:
+            exited = exited or (process is not None and process.poll() is not None)
+            timeout = 0 if exited else min(max(deadline - time.time(), 0), _EXIT_POLL_INTERVAL)
+            events = selector.select(timeout=timeout)
+            if exited and not events:
+                return
+            for key, _ in events:
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                yield key.fileobj, chunk
+
+
+def _read_chunks_threaded(pipes, deadline: float,
+                          process: Optional[subprocess.Popen] = None) -> Iterator[Tuple[Any, bytes]]:
+    """Like _read_chunks_selector, with one reader thread per pipe.
+
+    Used on Windows, where pipes can't be registered with a selector.
+    When reading stops before EOF, the pump threads stay blocked in os.read
+    until whatever still holds the pipes closes them; they are daemon
+    threads, so they never keep the interpreter alive.
+    """
+    chunks: "queue.Queue[Tuple[Any, bytes]]" = queue.Queue()
+
+    def pump(pipe):
+        while True:
+            chunk = os.read(pipe.fileno(), 65536)
+            chunks.put((pipe, chunk))
+            if not chunk:
+                return
+
+    for pipe in pipes:
+        threading.Thread(target=pump, args=(pipe,), daemon=True).start()
+
+    open_pipes = len(pipes)
+    exited = False
+    while open_pipes and time.time() < deadline:
+        exited = exited or (process is not None and process.poll() is not None)
+        try:
+            # After exit, give the pumps one interval to hand over what the
+            # process wrote, then stop
+            pipe, chunk = chunks.get(
+                timeout=min(max(deadline - time.time(), 0), _EXIT_POLL_INTERVAL)
+            )
+        except queue.Empty:
+            if exited:
+                return
+            continue
+        if not chunk:
+            open_pipes -= 1
+        yield pipe, chunk
+
+
+_read_chunks = _read_chunks_threaded if sys.platform == "win32" else _read_chunks_selector
+
 
 class RealTimeTestMonitor:
     """Monitor test execution in real-time to detect lies about test results."""
@@ -84,7 +220,7 @@ class RealTimeTestMonitor:
 
         # Results structure
         results = {
-            "command": " ".join(cmd),
+            "command": "",
             "start_time": datetime.now().isoformat(),
             "project": str(project_path),
             "total_tests": 0,
@@ -103,142 +239,159 @@ class RealTimeTestMonitor:
 
         # Run tests and capture output in real-time
         start_time = time.time()
-        output_lines = []
-        stderr_lines = []
+        # Output is kept as one growing buffer per stream rather than a list
+        # of per-line strings
+        stdout_buf = io.StringIO()
+        stderr_buf = io.StringIO()
+        # (test name, seconds) for every durations line, in output order
+        durations: List[Tuple[str, float]] = []
+
+        env = os.environ.copy()
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
 
+        process = None
         try:
             # Use Popen for real-time output capture
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
+                # The pipes are read with os.read, so skip the buffered wrappers
+                bufsize=0,
                 cwd=str(project_path),
-                env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+                env=env
             )
 
-            # Create queues for output
-            stdout_queue = queue.Queue()
-            stderr_queue = queue.Queue()
-
-            # Thread functions to read output
-            def read_stdout():
-                for line in process.stdout:
-                    stdout_queue.put(line)
-
-            def read_stderr():
-                for line in process.stderr:
-                    stderr_queue.put(line)
-
-            # Start reader threads
-            stdout_thread = threading.Thread(target=read_stdout)
-            stderr_thread = threading.Thread(target=read_stderr)
-            stdout_thread.start()
-            stderr_thread.start()
-
-            # Process output in real-time
-            test_pattern = re.compile(r'^(.*?)::(.*?)\s+(PASSED|FAILED|SKIPPED|ERROR)')
-            duration_pattern = re.compile(r'^([\d.]+)s\s+(.*?)::(.*)$')
-            import_error_pattern = re.compile(r'(ImportError|ModuleNotFoundError):(.*)$')
-
-            # Collect output with timeout
+            # Read both pipes as output becomes available, decoding like text
+            # mode (universal newlines) but without failing on stray bytes
+            encoding = locale.getpreferredencoding(False)
+            streams = {}
+            for pipe, buf in ((process.stdout, stdout_buf), (process.stderr, stderr_buf)):
+                decoder = io.IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder(encoding)("replace"), translate=True
+                )
+                streams[pipe] = (decoder, buf)
+
+            stdout_tail = ""
             deadline = time.time() + self.timeout
-            while process.poll() is None and time.time() < deadline:
-                # Check stdout
-                try:
-                    line = stdout_queue.get(timeout=0.1)
-                    output_lines.append(line)
-
-                    # Parse test results
-                    test_match = test_pattern.search(line)
-                    if test_match:
-                        results["total_tests"] += 1
-                        status = test_match.group(3)
-                        if status == "PASSED":
-                            results["passed_tests"] += 1
-                        elif status == "FAILED":
-                            results["failed_tests"] += 1
-
-                    # Parse durations
-                    duration_match = duration_pattern.search(line)
-                    if duration_match:
-                        duration = float(duration_match.group(1))
-                        test_name = f"{duration_match.group(2)}::{duration_match.group(3)}"
-                        results["test_durations"][test_name] = duration
-
-                        # Check for suspicious durations
-                        if duration < self.suspicious_duration_threshold:
-                            results["instant_tests"] += 1
-                            results["suspicious_tests"].append({
-                                "test": test_name,
-                                "duration": duration,
-                                "reason": "Completed too fast (likely mocked)"
-                            })
-
-                    # Check for import errors
-                    import_match = import_error_pattern.search(line)
-                    if import_match:
-                        results["import_errors"].append(line.strip())
-
-                except queue.Empty:
-                    pass
-
-                # Check stderr
-                try:
-                    line = stderr_queue.get(timeout=0.1)
-                    stderr_lines.append(line)
-                except queue.Empty:
-                    pass
+            for pipe, chunk in _read_chunks(list(streams), deadline, process):
+                decoder, buf = streams[pipe]
+                text = decoder.decode(chunk, final=not chunk)
+                buf.write(text)
+                if buf is not stdout_buf:
+                    continue
+
+                # Parse each complete stdout line as it arrives
+                lines = (stdout_tail + text).split("\n")
+                stdout_tail = lines.pop()
+                for line in lines:
+                    self._parse_output_line(line, results, durations)
+
+            # Reading can stop short of EOF (pytest exited but a leftover
+            # child holds the pipes), so flush the decoders here
+            for decoder, buf in streams.values():
+                text = decoder.decode(b"", final=True)
+                buf.write(text)
+                if buf is stdout_buf:
+                    stdout_tail += text
+            for line in stdout_tail.split("\n"):
+                if line:
+                    self._parse_output_line(line, results, durations)
 
             # Wait for process to complete
-            stdout_thread.join(timeout=1)
-            stderr_thread.join(timeout=1)
             process.wait(timeout=1)
 
             results["return_code"] = process.returncode
 
         except subprocess.TimeoutExpired:
             process.kill()
+            process.wait()
             results["error"] = f"Test execution timed out after {self.timeout}s"
             results["return_code"] = -1
 
         except Exception as e:
+            # Don't leave pytest running behind a failed monitor
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()
             results["error"] = f"Failed to execute tests: {str(e)}"
             results["return_code"] = -1
 
         # Calculate execution time
         results["execution_time"] = time.time() - start_time
 
+        # Check for suspicious durations, all at once rather than per line
+        threshold = self.suspicious_duration_threshold
+        results["suspicious_tests"] = [
+            {
+                "test": test_name,
+                "duration": duration,
+                "reason": "Completed too fast (likely mocked)"
+            }
+            for test_name, duration in durations if duration < threshold
+        ]
+        results["instant_tests"] = len(results["suspicious_tests"])
+
+        output = stdout_buf.getvalue()
+
         # Store raw output if requested
         if capture_raw:
-            results["raw_output"] = "".join(output_lines)
-            results["stderr"] = "".join(stderr_lines)
+            results["command"] = shlex.join(cmd)
+            results["raw_output"] = output
+            results["stderr"] = stderr_buf.getvalue()
 
         # Analyze output for mock indicators
-        results["mocked_test_indicators"] = self._detect_mock_indicators(output_lines)
+        results["mocked_test_indicators"] = self._detect_mock_indicators(output)
 
         # Check for common lies
         results["lies_detected"] = self._detect_common_lies(results)
 
         return results
 
-    def _detect_mock_indicators(self, output_lines: List[str]) -> List[Dict[str, str]]:
-        """Detect indicators that tests are using mocks."""
+    def _parse_output_line(self, line: str, results: Dict[str, Any],
+                           durations: List[Tuple[str, float]]) -> None:
+        """Update the counts in results from one line of pytest output.
+
+        Test durations are appended to durations for checking afterwards.
+        """
+        # Result and duration lines name a test (path::name); most output
+        # lines don't, and a substring test rules them out before any regex
+        if "::" in line:
+            # Parse test results
+            test_match = _TEST_RE.match(line)
+            if test_match:
+                results["total_tests"] += 1
+                status = test_match.group(3)
+                if status == "PASSED":
+                    results["passed_tests"] += 1
+                elif status == "FAILED":
+                    results["failed_tests"] += 1
+
+            # Parse durations
+            duration_match = _DURATION_RE.match(line)
+            if duration_match:
+                duration = float(duration_match.group(1))
+                test_name = f"{duration_match.group(2)}::{duration_match.group(3)}"
+                results["test_durations"][test_name] = duration
+                durations.append((test_name, duration))
+
+        # Check for import errors
+        if "Error:" in line and _IMPORT_ERROR_RE.search(line):
+            results["import_errors"].append(line.strip())
+
+    def _detect_mock_indicators(self, output: str) -> List[Dict[str, str]]:
+        """Detect indicators that tests are using mocks in captured output."""
         indicators = []
 
-        mock_patterns = [
-            (r'Mock.*called', "Mock object was called"),
-            (r'patch.*as.*mock', "Using patch decorator"),
-            (r'return_value\s*=', "Setting mock return value"),
-            (r'side_effect\s*=', "Setting mock side effect"),
-            (r'assert_called', "Asserting mock was called"),
-            (r'<MagicMock', "MagicMock object in output"),
-            (r'unittest\.mock', "unittest.mock import detected")
-        ]
+        # Most runs print nothing mock-related: rule that out in one pass
+        if not _may_contain_mock_output(output):
+            return indicators
 
-        for i, line in enumerate(output_lines):
-            for pattern, description in mock_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
+        for i, line in enumerate(output.split('\n')):
+            if not _ANY_MOCK_RE.search(line):
+                continue
+            for pattern, description in _MOCK_PATTERNS:
+                if pattern.search(line):
                     indicators.append({
                         "line_number": i + 1,
                         "line": line.strip(),
@@ -295,30 +448,23 @@ class RealTimeTestMonitor:
             "trust_score": 1.0
         }
 
-        # Compare test counts
-        if actual_results["total_tests"] != reported_results.get("total_tests", 0):
-            discrepancies["matches"] = False
-            discrepancies["differences"].append({
-                "field": "total_tests",
-                "actual": actual_results["total_tests"],
-                "reported": reported_results.get("total_tests", 0),
-                "severity": "high"
-            })
-
-        # Compare pass/fail counts
-        if actual_results["passed_tests"] != reported_results.get("passed_tests", 0):
-            discrepancies["matches"] = False
-            discrepancies["differences"].append({
-                "field": "passed_tests",
-                "actual": actual_results["passed_tests"],
-                "reported": reported_results.get("passed_tests", 0),
-                "severity": "critical"
-            })
+        # Compare test and pass counts
+        differences = discrepancies["differences"]
+        for field, severity in _COMPARE_FIELDS:
+            actual = actual_results[field]
+            reported = reported_results.get(field, 0)
+            if actual != reported:
+                differences.append({
+                    "field": field,
+                    "actual": actual,
+                    "reported": reported,
+                    "severity": severity
+                })
 
         # Calculate trust score
-        if discrepancies["differences"]:
-            critical_count = sum(1 for d in discrepancies["differences"]
-                               if d["severity"] == "critical")
+        if differences:
+            discrepancies["matches"] = False
+            critical_count = sum(1 for d in differences if d["severity"] == "critical")
             discrepancies["trust_score"] = max(0, 1 - (critical_count * 0.3))
 
         return discrepancies
@@ -2,7 +2,6 @@
 """
 Module: __init__.py
 Description: Package initialization and exports
-"""
 
 External Dependencies:
 - None (uses only standard library)
@@ -1,12 +1,12 @@
 """
 Module: code_review.py
+Description: Functions for code review operations
 
 Code review command for the CLI.
 """
 import sys
 from pathlib import Path
 from typing import Optional
-Description: Functions for code review operations
 
 import click
 from rich.console import Console
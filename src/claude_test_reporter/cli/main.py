@@ -2,7 +2,6 @@
 """
 Module: main.py
 Description: Functions for main operations
-"""
 
 External Dependencies:
 - typer: [Documentation URL]
@@ -42,20 +41,18 @@ Dependencies:
 import sys
 import json
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Optional, List
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich import print
 
-from claude_test_reporter.core.generators import UniversalReportGenerator
-from claude_test_reporter.core.generators.multi_project_dashboard import MultiProjectDashboard
-from claude_test_reporter.core.tracking import TestHistoryTracker
-from claude_test_reporter.core.adapters import AgentReportAdapter
+# Report generators, trackers and analyzers are imported in the commands
+# that use them, so --help and single commands don't load all of them
 from claude_test_reporter import get_report_config
-from claude_test_reporter.analyzers import LLMTestAnalyzer, TestReportVerifier
-from claude_test_reporter.core.test_result_verifier import TestResultVerifier, HallucinationDetector
 from claude_test_reporter.config import Config, setup_environment
+# Already loaded with the package; shares the adapter's orjson/stdlib loader
+from claude_test_reporter.core.adapters.agent_report_adapter import load_json as _read_json
 from .slash_mcp_mixin import add_slash_mcp_commands
 from .validate import validate
 from .code_review import code_review
@@ -63,6 +60,16 @@ from .code_review import code_review
 # Create console for pretty output
 console = Console()
 
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write data as indented JSON.
+
+    Stays on the stdlib encoder: orjson writes non-ASCII unescaped and NaN
+    as null, which would change the files this tool produces.
+    """
+    Path(path).write_text(json.dumps(data, indent=2))
+
+
 # Create Typer app
 app = typer.Typer(
     name="claude-test-cli",
@@ -83,13 +90,13 @@ def from_pytest(
         raise typer.Exit(1)
 
     try:
-        with open(json_file) as f:
-            data = json.load(f)
+        data = _read_json(json_file)
 
         # Get config if project specified
         config = get_report_config(project) if project else {}
 
         # Generate report
+        from claude_test_reporter.core.generators import UniversalReportGenerator
         generator = UniversalReportGenerator(config)
         html = generator.generate_pytest_report(data)
 
@@ -122,8 +129,7 @@ def from_data(
         raise typer.Exit(1)
 
     try:
-        with open(data_file) as f:
-            data = json.load(f)
+        data = _read_json(data_file)
 
         # Create config
         config = {
@@ -132,6 +138,7 @@ def from_data(
         }
 
         # Generate report
+        from claude_test_reporter.core.generators import UniversalReportGenerator
         generator = UniversalReportGenerator(config)
         html = generator.generate_from_data(data)
 
@@ -155,12 +162,18 @@ def analyze(
         raise typer.Exit(1)
 
     try:
-        with open(json_file) as f:
-            data = json.load(f)
-
-        # Create adapter for analysis
-        adapter = AgentReportAdapter()
-        analysis = adapter.analyze_results(data)
+        data = _read_json(json_file)
+
+        # Create adapter for analysis (reuses the loaded report)
+        from claude_test_reporter.core.adapters import AgentReportAdapter
+        adapter = AgentReportAdapter(project_name=project, data=data)
+        analysis = {
+            "failed_tests": [
+                {"name": test["test_id"], "error": test["error_message"]}
+                for test in adapter.get_failed_tests()
+            ],
+            "recommendations": [item["suggested_fix"] for item in adapter.get_actionable_items()],
+        }
 
         # Display analysis
         console.print("[cyan]Test Analysis[/cyan]")
@@ -214,6 +227,7 @@ def dashboard(
                 raise typer.Exit(1)
 
         # Create dashboard
+        from claude_test_reporter.core.generators.multi_project_dashboard import MultiProjectDashboard
         dashboard = MultiProjectDashboard()
 
         # Add projects
@@ -222,8 +236,7 @@ def dashboard(
             json_files = list(dir_path.glob("**/test-results*.json"))
             if json_files:
                 latest_file = max(json_files, key=lambda f: f.stat().st_mtime)
-                with open(latest_file) as f:
-                    data = json.load(f)
+                data = _read_json(latest_file)
                 dashboard.add_project(dir_path.name, data)
                 console.print(f"[green]✓[/green] Added project: {dir_path.name}")
             else:
@@ -249,6 +262,7 @@ def history(
 ):
     """Show test history and trends."""
     try:
+        from claude_test_reporter.core.tracking import TestHistoryTracker
         tracker = TestHistoryTracker()
         history_data = tracker.get_history(project, days=days)
 
@@ -305,11 +319,11 @@ def format(
         raise typer.Exit(1)
 
     try:
-        with open(json_file) as f:
-            data = json.load(f)
+        data = _read_json(json_file)
 
-        # Create adapter
-        adapter = AgentReportAdapter()
+        # Create adapter (reuses the loaded report)
+        from claude_test_reporter.core.adapters import AgentReportAdapter
+        adapter = AgentReportAdapter(data=data)
 
         # Format based on style
         if style == "claude":
@@ -390,16 +404,17 @@ def verify_test_results(
         raise typer.Exit(1)
 
     try:
-        with open(json_file) as f:
-            test_results = json.load(f)
+        test_results = _read_json(json_file)
 
         # Create verifier
+        from claude_test_reporter.analyzers import TestReportVerifier
+        from claude_test_reporter.core.test_result_verifier import TestResultVerifier
         verifier = TestResultVerifier()
 
         if format == "json":
             # Create immutable record
             record = verifier.create_immutable_test_record(test_results)
-            output.write_text(json.dumps(record, indent=2))
+            _write_json(output, record)
 
             console.print(f"[green]✓[/green] Verified record created: {output}")
             console.print(f"  Hash: {record['verification']['hash'][:16]}...")
@@ -422,7 +437,9 @@ def llm_analyze(
     project: str = typer.Argument(..., help="Project name"),
     model: str = typer.Option("gemini-2.5-pro", "--model", "-m", help="LLM model to use"),
     output: Path = typer.Option("llm_analysis.json", "--output", "-o", help="Output file"),
-    temperature: float = typer.Option(0.1, "--temperature", "-t", help="LLM temperature (0.0-1.0)")
+    temperature: float = typer.Option(0.1, "--temperature", "-t", help="LLM temperature (0.0-1.0)"),
+    cache_dir: Path = typer.Option(".llm_cache", "--cache-dir", help="Directory for cached LLM responses"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always ask the LLM; don't read or write the cache")
 ):
     """Analyze test results with LLM (Gemini 2.5 Pro) for insights."""
     if not json_file.exists():
@@ -430,13 +447,14 @@ def llm_analyze(
         raise typer.Exit(1)
 
     try:
-        with open(json_file) as f:
-            test_results = json.load(f)
+        test_results = _read_json(json_file)
 
         console.print(f"[cyan]Analyzing with {model}...[/cyan]")
 
         # Create analyzer
-        analyzer = LLMTestAnalyzer(model=model, temperature=temperature)
+        from claude_test_reporter.analyzers import LLMTestAnalyzer
+        analyzer = LLMTestAnalyzer(model=model, temperature=temperature,
+                                   cache_dir=None if no_cache else str(cache_dir))
 
         # Generate analysis
         report_path = analyzer.generate_anti_hallucination_report(
@@ -446,8 +464,7 @@ def llm_analyze(
         console.print(f"[green]✓[/green] Analysis complete: {report_path}")
 
         # Load and show key findings
-        with open(report_path) as f:
-            report = json.load(f)
+        report = _read_json(report_path)
 
         analysis = report.get("llm_analysis", {})
         if "error" not in analysis:
@@ -485,13 +502,13 @@ def check_hallucination(
 
     try:
         # Load verified results
-        with open(results_file) as f:
-            verified_record = json.load(f)
+        verified_record = _read_json(results_file)
 
         # Load response text
         response_text = response_file.read_text()
 
         # Create detector
+        from claude_test_reporter.core.test_result_verifier import HallucinationDetector
         detector = HallucinationDetector()
 
         # Check for hallucinations
@@ -518,7 +535,7 @@ def check_hallucination(
                 "response_analyzed": response_text[:500] + "..." if len(response_text) > 500 else response_text,
                 "hallucination_check": result
             }
-            output.write_text(json.dumps(report, indent=2))
+            _write_json(output, report)
             console.print(f"\n[green]✓[/green] Detailed report saved: {output}")
 
     except Exception as e:
@@ -538,10 +555,10 @@ def create_llm_prompt(
         raise typer.Exit(1)
 
     try:
-        with open(json_file) as f:
-            test_results = json.load(f)
+        test_results = _read_json(json_file)
 
         # Create verifier
+        from claude_test_reporter.core.test_result_verifier import TestResultVerifier
         verifier = TestResultVerifier()
 
         # Generate prompt
@@ -612,8 +629,7 @@ def judge_command(
 
     try:
         # Load test results
-        with open(json_file) as f:
-            test_results = json.load(f)
+        test_results = _read_json(json_file)
 
         # Check if validation is needed
         summary = test_results.get('summary', {})
@@ -634,8 +650,7 @@ def judge_command(
         validation_results = validator.validate_all_tests(test_results)
 
         # Save results
-        with open(output, 'w') as f:
-            json.dump(validation_results, f, indent=2)
+        _write_json(output, validation_results)
 
         # Display summary
         summary = validation_results.get('summary', {})
@@ -1,7 +1,6 @@
 """
 Module: slash_mcp_mixin.py
 
-"""
 Universal Slash Command and MCP Generation for Typer CLIs
 Description: Functions for slash mcp mixin operations
 
@@ -1,5 +1,6 @@
 """
 Module: validate.py
+Description: Functions for validate operations
 
 Validation command for test results using LLM.
 """
@@ -7,7 +8,6 @@ import json
 import sys
 from pathlib import Path
 from typing import Optional
-Description: Functions for validate operations
 
 import click
 from rich.console import Console
@@ -2,7 +2,6 @@
 """
 Module: config.py
 Description: Configuration management and settings
-"""
 
 External Dependencies:
 - dataclasses: [Documentation URL]
@@ -4,7 +4,7 @@ Module: agent_report_adapter.py
 Description: Implementation of agent report adapter functionality
 
 External Dependencies:
-- None (uses only standard library)
+- orjson (optional): https://github.com/ijl/orjson
 
 Sample Input:
 >>> # Add specific examples based on module functionality
@@ -24,6 +24,11 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Use relative import for TestHistoryTracker
 try:
     from ..tracking import TestHistoryTracker
@@ -32,12 +37,34 @@ except ImportError:
     TestHistoryTracker = None
 
 
+def load_json(path: Path) -> Any:
+    """Load a JSON file, with orjson when it is installed.
+
+    Anything orjson rejects but json.load accepts (NaN/Infinity, lone
+    surrogates) goes through the stdlib parser. Integers wider than 64 bits,
+    which orjson reads as floats, don't occur in test reports.
+    """
+    if orjson is not None:
+        data = Path(path).read_bytes()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+    with open(path) as f:
+        return json.load(f)
+
+
 class AgentReportAdapter:
     """Adapt pytest-json-report output for agent consumption."""
 
-    def __init__(self, json_report_path: Path, project_name: Optional[str] = None):
-        with open(json_report_path) as f:
-            self.data = json.load(f)
+    def __init__(self, json_report_path: Optional[Path] = None, project_name: Optional[str] = None,
+                 data: Optional[Dict[str, Any]] = None):
+        """Read the report at json_report_path, or use an already-loaded report as data."""
+        if data is None:
+            if json_report_path is None:
+                raise ValueError("Either json_report_path or data is required")
+            data = load_json(json_report_path)
+        self.data = data
         self.project_name = project_name or "Unknown"
         self.history_tracker = TestHistoryTracker() if TestHistoryTracker else None
 
@@ -0,0 +1,148 @@
+"""Tests for the implementation verifier's result cache and project scan."""
+import pickle
+
+import pytest
+
+from claude_test_reporter.analyzers import implementation_verifier
+from claude_test_reporter.analyzers.implementation_verifier import (
+    PARALLEL_MIN_FILES,
+    ImplementationVerifier,
+)
+
+MARKER_SOURCE = (
+    "def a():\n    x = 1\n    y = x + 1\n    return y\n\n"
+    "def b():\n    x = 1  # TODO finish\n    y = x + 1\n    return y\n"
+)
+SKELETON_SOURCE = "def todo():\n    pass\n\ndef real(x):\n    y = x + 1\n    z = y * 2\n    return z\n"
+
+
+def _write_package(root, count):
+    """Lay out a package of count modules, alternating stubs and real code.
+
+    A test module and a __pycache__ copy sit alongside; scan_project skips both.
+    """
+    package = root / "pkg"
+    (package / "__pycache__").mkdir(parents=True)
+    for i in range(count):
+        body = "    pass\n" if i % 2 else "    a = 1\n    b = a + 1\n    return b\n"
+        (package / f"mod_{i}.py").write_text(f"def func_{i}():\n{body}")
+    (package / "test_mod.py").write_text("def test_stub():\n    pass\n")
+    (package / "__pycache__" / "mod_0.py").write_text("def cached():\n    pass\n")
+    return root
+
+
+class TestResultCache:
+    def test_unchanged_source_is_served_from_cache(self, tmp_path, monkeypatch):
+        """A second analysis of the same bytes does not re-run analyze_code."""
+        source = tmp_path / "mod.py"
+        source.write_text(SKELETON_SOURCE)
+        verifier = ImplementationVerifier(cache_dir=str(tmp_path / "cache"))
+        first = verifier.analyze_file(str(source))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("analyze_code called on a cache hit")
+
+        monkeypatch.setattr(verifier, "analyze_code", fail)
+        assert verifier.analyze_file(str(source)) == first
+
+    def test_changed_source_is_reanalyzed(self, tmp_path):
+        """Editing a file changes its cache key, so the new contents are analyzed."""
+        source = tmp_path / "mod.py"
+        source.write_text(SKELETON_SOURCE)
+        verifier = ImplementationVerifier(cache_dir=str(tmp_path / "cache"))
+        assert verifier.analyze_file(str(source))["skeleton_count"] == 1
+
+        source.write_text("def a():\n    pass\n\ndef b():\n    pass\n")
+        assert verifier.analyze_file(str(source))["skeleton_count"] == 2
+
+    def test_version_bump_invalidates_entries(self, tmp_path, monkeypatch):
+        """Entries written under another VERIFIER_VERSION are not reused."""
+        source = tmp_path / "mod.py"
+        source.write_text(SKELETON_SOURCE)
+        verifier = ImplementationVerifier(cache_dir=str(tmp_path / "cache"))
+        old_entry = verifier._cache_path(source.read_bytes())
+        verifier.analyze_file(str(source))
+
+        monkeypatch.setattr(implementation_verifier, "VERIFIER_VERSION", "test")
+        assert verifier._cache_path(source.read_bytes()) != old_entry
+        assert verifier._load_cached(verifier._cache_path(source.read_bytes())) is None
+
+    @pytest.mark.parametrize("corrupt", [
+        lambda good: good[:len(good) // 2],
+        lambda good: b"not a pickle",
+        lambda good: b"\x80\x04c__main__\nNoSuchClass\n.",
+    ])
+    def test_unreadable_entry_is_a_miss(self, tmp_path, corrupt):
+        """Truncated or stale entries are dropped and the file re-analyzed."""
+        source = tmp_path / "mod.py"
+        source.write_text(SKELETON_SOURCE)
+        verifier = ImplementationVerifier(cache_dir=str(tmp_path / "cache"))
+        expected = verifier.analyze_file(str(source))
+        entry = verifier._cache_path(source.read_bytes())
+        entry.write_bytes(corrupt(entry.read_bytes()))
+
+        result = verifier.analyze_file(str(source))
+        assert "error" not in result
+        assert result == expected
+        assert pickle.loads(entry.read_bytes())["skeleton_count"] == 1
+
+
+class TestAnalyzeCode:
+    def test_source_without_definitions_has_no_functions(self):
+        """Module-level code reports the usual empty shape."""
+        result = ImplementationVerifier().analyze_code("x = 1\nprint(x)\n")
+        assert result["total_functions"] == 0
+        assert result["skeleton_ratio"] == 0.0
+        assert result["skeleton_patterns"] == {}
+
+    def test_source_without_definitions_reports_syntax_errors(self):
+        """Code without def/class still gets its syntax checked."""
+        verifier = ImplementationVerifier()
+        assert "error" in verifier.analyze_code("x = (1,")
+        assert "error" not in verifier.analyze_code("x = 1")
+
+    @pytest.mark.parametrize("newline", ["\r", "\r\n"])
+    @pytest.mark.parametrize("mmap_threshold", [0, implementation_verifier.MMAP_THRESHOLD])
+    def test_markers_follow_cr_line_endings(self, tmp_path, monkeypatch, newline, mmap_threshold):
+        """Markers land on the right function whatever the file's line endings."""
+        monkeypatch.setattr(implementation_verifier, "MMAP_THRESHOLD", mmap_threshold)
+        source = tmp_path / "mod.py"
+        source.write_bytes(MARKER_SOURCE.replace("\n", newline).encode("utf-8"))
+        result = ImplementationVerifier().analyze_file(str(source))
+        assert result["skeleton_functions"] == ["b"]
+        assert result["skeleton_patterns"] == {"TODO": ["b"]}
+
+
+class TestScanProject:
+    def test_serial_by_default(self, tmp_path, monkeypatch):
+        """Without max_workers no process pool is started."""
+        _write_package(tmp_path, PARALLEL_MIN_FILES * 2)
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started by default")
+
+        monkeypatch.setattr(implementation_verifier, "ProcessPoolExecutor", no_pool)
+        results = ImplementationVerifier().scan_project(str(tmp_path))
+        assert results["total_files"] == PARALLEL_MIN_FILES * 2
+
+    def test_worker_summaries_match_in_process_analysis(self, tmp_path):
+        """Files analyzed in worker processes aggregate to the in-process result."""
+        _write_package(tmp_path, PARALLEL_MIN_FILES * 2)
+        verifier = ImplementationVerifier()
+
+        serial = verifier.scan_project(str(tmp_path), max_workers=1, keep_file_results=True)
+        pooled = verifier.scan_project(str(tmp_path), max_workers=2, keep_file_results=True)
+        assert pooled == serial
+        assert serial["total_files"] == PARALLEL_MIN_FILES * 2
+        assert serial["skeleton_functions"] == PARALLEL_MIN_FILES
+        assert sorted(entry["skeleton_functions"][0] for entry in serial["skeleton_files"]) == sorted(
+            f"func_{i}" for i in range(1, PARALLEL_MIN_FILES * 2, 2)
+        )
+
+    def test_file_results_are_opt_in(self, tmp_path):
+        """Per-file analyses are only returned when asked for."""
+        _write_package(tmp_path, 2)
+        verifier = ImplementationVerifier()
+        assert verifier.scan_project(str(tmp_path))["file_results"] == {}
+        kept = verifier.scan_project(str(tmp_path), keep_file_results=True)["file_results"]
+        assert sorted(kept) == sorted(str(tmp_path / "pkg" / f"mod_{i}.py") for i in range(2))
@@ -0,0 +1,77 @@
+"""Tests for the integration tester's shared HTTP session."""
+import asyncio
+
+from claude_test_reporter.analyzers.integration_tester import IntegrationTester
+
+
+class TestSharedSession:
+    def test_session_outlives_tests_inside_async_with(self):
+        """Every test in an "async with" block reuses one session, closed on exit."""
+        async def run():
+            async with IntegrationTester() as tester:
+                first = await tester._get_session()
+                await tester._release_modules()
+                second = await tester._get_session()
+                await tester._release_modules()
+                assert second is first
+                assert not first.closed
+            return first
+
+        assert asyncio.run(run()).closed
+
+    def test_bare_use_closes_session_after_each_test(self):
+        """Without "async with" nothing calls aclose(), so each test closes its session."""
+        tester = IntegrationTester()
+
+        async def run():
+            session = await tester._get_session()
+            await tester._release_modules()
+            return session
+
+        assert asyncio.run(run()).closed
+        # A later asyncio.run() gets a fresh session in its own loop
+        assert asyncio.run(run()).closed
+
+
+class TestModuleCommunication:
+    def test_failed_receive_check_still_counts_the_send(self, monkeypatch):
+        """A send that went through is counted even when reading it back fails."""
+        from aiohttp import web
+
+        async def send(request):
+            return web.json_response({"ok": True})
+
+        async def messages(request):
+            return web.Response(text="not json")
+
+        async def run():
+            app = web.Application()
+            app.router.add_post("/send", send)
+            app.router.add_get("/messages", messages)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            async def ensure_module(name, module_port):
+                return object()
+
+            async def ready(module_port, timeout=None):
+                return True
+
+            tester = IntegrationTester()
+            monkeypatch.setattr(tester, "_ensure_module", ensure_module)
+            monkeypatch.setattr(tester, "_wait_until_ready", ready)
+            try:
+                return await tester.test_module_communication(
+                    {"name": "a", "port": port}, {"name": "b", "port": port}
+                )
+            finally:
+                await runner.cleanup()
+
+        results = asyncio.run(run())
+        assert results["messages_sent"] == 3
+        assert results["messages_received"] == 0
+        assert len(results["errors"]) == 3
+        assert all(error.startswith("Communication error") for error in results["errors"])
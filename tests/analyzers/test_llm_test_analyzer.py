@@ -0,0 +1,111 @@
+"""Tests for the LLM test analyzer's response cache."""
+import json
+import os
+
+from claude_test_reporter.analyzers import llm_test_analyzer
+from claude_test_reporter.analyzers.llm_test_analyzer import (
+    CACHEABLE_TEMPERATURE,
+    LLMTestAnalyzer,
+)
+
+
+class _RecordingLLM:
+    """Stands in for llm_call.call_llm, counting calls and answering with JSON."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return json.dumps({"answer": self.calls})
+
+
+def _install_llm(monkeypatch):
+    llm = _RecordingLLM()
+    monkeypatch.setattr(llm_test_analyzer, "call_llm", llm)
+    return llm
+
+
+class TestResponseCache:
+    def test_repeated_prompt_is_served_from_disk(self, tmp_path, monkeypatch):
+        """A deterministic call with the same prompt reaches the LLM once, across instances."""
+        llm = _install_llm(monkeypatch)
+        first = LLMTestAnalyzer(cache_dir=str(tmp_path))._call_llm_json("prompt", 0.0)
+        second = LLMTestAnalyzer(cache_dir=str(tmp_path))._call_llm_json("prompt", 0.0)
+        assert first == second == {"answer": 1}
+        assert llm.calls == 1
+
+    def test_key_covers_prompt_model_and_temperature(self, tmp_path, monkeypatch):
+        """Changing any part of the request is a cache miss."""
+        llm = _install_llm(monkeypatch)
+        analyzer = LLMTestAnalyzer(cache_dir=str(tmp_path))
+        analyzer._call_llm_json("prompt", 0.0)
+        analyzer._call_llm_json("other prompt", 0.0)
+        analyzer._call_llm_json("prompt", 0.1)
+        LLMTestAnalyzer(model="other-model", cache_dir=str(tmp_path))._call_llm_json("prompt", 0.0)
+        assert llm.calls == 4
+
+    def test_key_covers_response_format(self, tmp_path, monkeypatch):
+        """A changed response schema is a cache miss even for the same prompt."""
+        llm = _install_llm(monkeypatch)
+        analyzer = LLMTestAnalyzer(cache_dir=str(tmp_path))
+        schema = {"type": "json_schema", "json_schema": {"name": "A", "schema": {"type": "object"}}}
+        changed = {"type": "json_schema", "json_schema": {"name": "B", "schema": {"type": "object"}}}
+        analyzer._call_llm_json("prompt", 0.0, schema)
+        analyzer._call_llm_json("prompt", 0.0, dict(reversed(list(schema.items()))))
+        analyzer._call_llm_json("prompt", 0.0, changed)
+        assert llm.calls == 2
+
+    def test_high_temperature_is_not_cached(self, tmp_path, monkeypatch):
+        """Sampled answers are always fetched fresh and never written."""
+        llm = _install_llm(monkeypatch)
+        analyzer = LLMTestAnalyzer(cache_dir=str(tmp_path))
+        temperature = CACHEABLE_TEMPERATURE + 0.5
+        analyzer._call_llm_json("prompt", temperature)
+        analyzer._call_llm_json("prompt", temperature)
+        assert llm.calls == 2
+        assert list(tmp_path.iterdir()) == []
+
+    def test_expired_entry_is_refetched(self, tmp_path, monkeypatch):
+        """Entries older than the TTL are ignored."""
+        llm = _install_llm(monkeypatch)
+        analyzer = LLMTestAnalyzer(cache_dir=str(tmp_path), cache_ttl_days=1)
+        analyzer._call_llm_json("prompt", 0.0)
+        for entry in tmp_path.iterdir():
+            os.utime(entry, (0, 0))
+        assert analyzer._call_llm_json("prompt", 0.0) == {"answer": 2}
+        assert llm.calls == 2
+
+    def test_corrupt_entry_is_refetched(self, tmp_path, monkeypatch):
+        """An unreadable entry costs an LLM call rather than an error."""
+        llm = _install_llm(monkeypatch)
+        analyzer = LLMTestAnalyzer(cache_dir=str(tmp_path))
+        analyzer._call_llm_json("prompt", 0.0)
+        for entry in tmp_path.iterdir():
+            entry.write_text("{not json")
+        assert analyzer._call_llm_json("prompt", 0.0) == {"answer": 2}
+        assert llm.calls == 2
+
+    def test_disabled_without_cache_dir(self, monkeypatch):
+        """cache_dir=None always calls the LLM."""
+        llm = _install_llm(monkeypatch)
+        analyzer = LLMTestAnalyzer(cache_dir=None)
+        analyzer._call_llm_json("prompt", 0.0)
+        analyzer._call_llm_json("prompt", 0.0)
+        assert llm.calls == 2
+
+
+class TestReportFile:
+    def test_report_is_written_by_the_stdlib(self, tmp_path, monkeypatch):
+        """The saved report keeps json.dumps output: escaped non-ASCII and NaN."""
+        _install_llm(monkeypatch)
+        output = tmp_path / "report.json"
+        LLMTestAnalyzer(cache_dir=None).generate_anti_hallucination_report(
+            {"total": 1, "passed": 0, "failed": 1, "success_rate": float("nan")},
+            "café", output_file=str(output)
+        )
+
+        text = output.read_text()
+        assert '"project": "caf\\u00e9"' in text
+        assert '"success_rate": NaN' in text
+        assert json.loads(text)["llm_analysis"] == {"answer": 1}
@@ -0,0 +1,123 @@
+"""Tests for the mock detector's file walk, content cache and project scan."""
+import pytest
+
+from claude_test_reporter.analyzers import mock_detector
+from claude_test_reporter.analyzers.mock_detector import (
+    PARALLEL_MIN_FILES,
+    MockDetector,
+    _iter_test_files,
+)
+
+MOCKED_TEST = '''from unittest.mock import patch, Mock
+
+@patch("requests.get")
+def test_fetch(mock_get):
+    mock_get.return_value = Mock(status_code=200)
+    assert mock_get.called
+'''
+
+REAL_TEST = '''import json
+
+def test_roundtrip():
+    assert json.loads(json.dumps({"a": 1})) == {"a": 1}
+'''
+
+
+def _write_test_tree(root, count):
+    """Lay out count test files under tests/, split between unit and integration.
+
+    Every other file uses mocks; a helper module per directory is not a test file.
+    """
+    for i in range(count):
+        kind = "integration" if i % 4 < 2 else "unit"
+        directory = root / "tests" / kind
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"test_{kind}_{i}.py").write_text(MOCKED_TEST if i % 2 else REAL_TEST)
+        (directory / "helpers.py").write_text(REAL_TEST)
+    return root
+
+
+class TestIterTestFiles:
+    def test_matches_rglob_order(self, tmp_path):
+        """The scandir walk yields the same paths in the same order as rglob."""
+        _write_test_tree(tmp_path, 6)
+        (tmp_path / "tests" / "unit" / "nested").mkdir()
+        (tmp_path / "tests" / "unit" / "nested" / "test_deep.py").write_text(REAL_TEST)
+        tests_dir = tmp_path / "tests"
+        expected = [str(p) for p in tests_dir.rglob("test_*.py")]
+        assert list(_iter_test_files(str(tests_dir))) == expected
+
+    def test_missing_directory_yields_nothing(self, tmp_path):
+        """A directory that does not exist is skipped rather than raising."""
+        assert list(_iter_test_files(str(tmp_path / "missing"))) == []
+
+
+class TestAnalyzeTestContent:
+    def test_cached_result_is_a_copy(self):
+        """Mutating a returned report does not leak into later calls."""
+        detector = MockDetector()
+        first = detector.analyze_test_content(MOCKED_TEST, "test_api.py")
+        first["mock_types"].append("tampered")
+        second = detector.analyze_test_content(MOCKED_TEST, "test_other.py")
+        assert "tampered" not in second["mock_types"]
+        assert second["filename"] == "test_other.py"
+
+    def test_ast_gating_does_not_change_results(self):
+        """Skipping the AST pass for mock-free content gives the same report."""
+        gated = MockDetector().analyze_test_content(REAL_TEST, "test_real.py")
+        full = MockDetector().analyze_test_content(REAL_TEST, "test_real.py", parse_ast=True)
+        assert gated == full
+
+    @pytest.mark.parametrize("source", [
+        "import multipledispatch\n",
+        "import dispatcher.patches\n",
+        "from mockingbird import sing\n",
+    ])
+    def test_lookalike_imports_are_not_mocks(self, tmp_path, source):
+        """Modules that merely contain 'mock' or 'patch' don't count as mocking."""
+        test_file = tmp_path / "tests" / "integration" / "test_a.py"
+        test_file.parent.mkdir(parents=True)
+        test_file.write_text(source + REAL_TEST)
+
+        result = MockDetector().scan_test_file(str(test_file))
+        assert result["has_mocks"] is False
+        assert result["mock_score"] == 0.0
+        assert result["violations"] == []
+
+    @pytest.mark.parametrize("source", [
+        "import mock\n",
+        "import unittest.mock\n",
+        "import pytest_mock\n",
+        "from unittest import mock\n",
+        "from unittest.mock import sentinel\n",
+        "from mock import sentinel\n",
+    ])
+    def test_mock_module_imports_count(self, source):
+        """Importing a real mock module is mock usage, however it is spelled."""
+        result = MockDetector().analyze_test_content(source + REAL_TEST, "test_integration_api.py")
+        assert result["mock_count"] == 1
+        assert result["violations"] == ["Mock usage detected in integration test"]
+
+
+class TestScanProject:
+    def test_serial_by_default(self, tmp_path, monkeypatch):
+        """Without max_workers no process pool is started."""
+        _write_test_tree(tmp_path, PARALLEL_MIN_FILES * 2)
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started by default")
+
+        monkeypatch.setattr(mock_detector, "ProcessPoolExecutor", no_pool)
+        results = MockDetector().scan_project(str(tmp_path))
+        assert results["total_test_files"] == PARALLEL_MIN_FILES * 2
+
+    def test_pooled_scan_merges_in_walk_order(self, tmp_path):
+        """Worker results are merged in file order, exactly as a serial scan does."""
+        _write_test_tree(tmp_path, PARALLEL_MIN_FILES * 2)
+        serial = MockDetector().scan_project(str(tmp_path), max_workers=1)
+        pooled = MockDetector().scan_project(str(tmp_path), max_workers=2)
+        assert pooled == serial
+        assert list(pooled["file_results"]) == list(serial["file_results"])
+        assert serial["total_test_files"] == PARALLEL_MIN_FILES * 2
+        assert serial["files_with_mocks"] == PARALLEL_MIN_FILES
+        assert serial["integration_tests_with_mocks"] == PARALLEL_MIN_FILES // 2
@@ -0,0 +1,117 @@
+"""Tests for the deception pattern analyzer."""
+from difflib import SequenceMatcher
+from itertools import combinations
+
+import pytest
+
+from claude_test_reporter.analyzers.pattern_analyzer import DeceptionPatternAnalyzer
+
+SHARED_ERRORS = [
+    "ConnectionError: refused at line 12",
+    "Timeout in /app/client.py",
+    "KeyError: 'id'",
+    "AssertionError: expected 200",
+    "ValueError: bad input",
+    "RuntimeError: 0x7f3a closed",
+]
+
+PROJECTS = [
+    {"project": "alpha", "total_tests": 50, "failed_tests": 0, "instant_tests": 40,
+     "mock_score": 0.9, "integration_tests": 0, "error_messages": SHARED_ERRORS},
+    {"project": "beta", "total_tests": 30, "failed_tests": 0, "instant_tests": 12,
+     "mock_score": 0.8, "integration_tests": 2, "integration_tests_with_mocks": 1,
+     "error_messages": ["ConnectionError: refused at line 99", "Timeout in /srv/client.py",
+                        "KeyError: 'id'", "AssertionError: expected 200",
+                        "ValueError: bad input", "RuntimeError: 0x0 closed"]},
+    {"project": "gamma", "total_tests": 40, "failed_tests": 4, "instant_tests": 2,
+     "mock_score": 0.6, "integration_tests": 8, "error_messages": ["Document not found"]},
+    {"project": "delta", "total_tests": 20, "failed_tests": 0, "instant_tests": 1,
+     "mock_score": 0.55, "integration_tests": 1, "error_messages": ["KeyError: 'id'"]},
+    {"project": "epsilon", "total_tests": 5, "failed_tests": 1, "instant_tests": 0,
+     "mock_score": 0.1, "integration_tests": 1},
+]
+
+SOURCES = {
+    "original.py": "def add(a, b):\n    return a + b\n\ndef sub(a, b):\n    return a - b\n",
+    "renamed.py": "def add(x, y):\n    return x + y\n\ndef sub(x, y):\n    return x - y\n",
+    "copied.py": "def add(a, b):\n    return a + b\n\ndef sub(a, b):\n    return a - b\n\n",
+    "other.py": "import json\n\nprint(json.dumps({'key': [1, 2, 3]}))\n",
+    "short.py": "x = 1\n",
+    "empty.py": "",
+}
+
+
+class TestAnalyzeProjectPatterns:
+    def test_report_for_known_projects(self):
+        """Scores, findings and recommendations for a fixed set of projects."""
+        analysis = DeceptionPatternAnalyzer().analyze_project_patterns(PROJECTS)
+
+        assert analysis["total_projects"] == 5
+        assert analysis["deception_scores"] == pytest.approx(
+            {"alpha": 0.81, "beta": 0.56, "gamma": 0.195, "delta": 0.38, "epsilon": 0.03}
+        )
+        assert analysis["overall_deception_score"] == pytest.approx(0.395)
+        assert analysis["patterns_found"] == ["mock", "error", "perfect_test"]
+        assert analysis["high_risk_projects"] == [{
+            "project": "alpha",
+            "score": pytest.approx(0.81),
+            "main_issues": ["excessive_instant_tests", "excessive_mocking",
+                            "suspiciously_perfect", "no_integration_tests"],
+        }]
+        assert sorted(analysis["repeated_patterns"]) == [
+            "copy_paste_errors", "instant_test_epidemic", "mock_abuse_pattern"
+        ]
+        assert analysis["repeated_patterns"]["copy_paste_errors"]["repeated_errors"] == 6
+        assert analysis["recommendations"] == [
+            "Force minimum test durations for integration tests (>0.1s)",
+            "Priority review needed for: alpha",
+        ]
+
+    def test_identical_errors_across_projects(self):
+        """Errors differing only in paths, line numbers or addresses are grouped."""
+        errors = DeceptionPatternAnalyzer()._analyze_patterns(PROJECTS)["error_pattern"]
+
+        assert errors["repeated_count"] == 6
+        assert errors["severity"] == pytest.approx(6 / 7)
+        assert errors["examples"][:3] == [
+            ("connectionerror: refused at line <num>", ["alpha", "beta"]),
+            ("timeout in <file>", ["alpha", "beta"]),
+            ("keyerror: 'id'", ["alpha", "beta", "delta"]),
+        ]
+        assert errors["most_common"] == [
+            ("keyerror: 'id'", 3),
+            ("connectionerror: refused at line <num>", 2),
+            ("timeout in <file>", 2),
+        ]
+
+
+class TestCompareCodeSimilarity:
+    def test_bounds_only_skip_dissimilar_pairs(self, tmp_path):
+        """The quick-ratio bounds report exactly the pairs a full ratio() would."""
+        for name, content in SOURCES.items():
+            (tmp_path / name).write_text(content)
+        paths = [str(tmp_path / name) for name in SOURCES]
+        pairs = list(combinations(paths, 2))
+        analyzer = DeceptionPatternAnalyzer()
+
+        expected = [
+            (file1, file2)
+            for file1, file2 in pairs
+            if SequenceMatcher(None, open(file1).read(), open(file2).read()).ratio()
+            > analyzer.similarity_threshold
+        ]
+        assert expected
+        result = analyzer.compare_code_similarity(pairs)
+        assert result["files_compared"] == len(pairs)
+        assert result["suspicious_similarities"] == len(expected)
+        assert [(e["file1"], e["file2"]) for e in result["examples"]] == expected[:5]
+
+    def test_unreadable_files_are_skipped(self, tmp_path):
+        """Pairs with a missing file are counted but never reported."""
+        present = tmp_path / "present.py"
+        present.write_text(SOURCES["original.py"])
+        result = DeceptionPatternAnalyzer().compare_code_similarity(
+            [(str(present), str(tmp_path / "missing.py")), (str(present), str(present))]
+        )
+        assert result["files_compared"] == 2
+        assert result["suspicious_similarities"] == 1
@@ -0,0 +1,184 @@
+"""Tests for the real-time monitor's pipe readers and output parsing."""
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from claude_test_reporter.analyzers import realtime_monitor
+from claude_test_reporter.analyzers.realtime_monitor import (
+    _DURATION_RE,
+    _MOCK_PATTERNS,
+    _TEST_RE,
+    RealTimeTestMonitor,
+    _may_contain_mock_output,
+    _read_chunks_selector,
+    _read_chunks_threaded,
+)
+
+READERS = [
+    pytest.param(_read_chunks_selector, id="selector",
+                 marks=pytest.mark.skipif(sys.platform == "win32",
+                                          reason="pipes can't be selected on Windows")),
+    pytest.param(_read_chunks_threaded, id="threaded"),
+]
+
+# The patterns _TEST_RE and _DURATION_RE replaced
+_LAZY_TEST_RE = re.compile(r'^(.*?)::(.*?)\s+(PASSED|FAILED|SKIPPED|ERROR)')
+_LAZY_DURATION_RE = re.compile(r'^([\d.]+)s\s+(.*?)::(.*)$')
+
+SAMPLE_LINES = [
+    "tests/test_api.py::test_fetch PASSED",
+    "tests/test_api.py::TestClient::test_post FAILED",
+    "tests/test_api.py::test_param[a-b]   SKIPPED (reason)",
+    "tests/test_api.py::test_error ERROR",
+    "0.52s call     tests/test_api.py::test_fetch",
+    "0.00s setup    tests/test_api.py::TestClient::test_post",
+    "collected 4 items",
+    "E   AssertionError: x::y" + " " * 200 + "nope",
+]
+
+PASSING_TEST = '''import time
+
+def test_sleeps():
+    time.sleep(0.05)
+
+def test_adds():
+    assert 1 + 1 == 2
+'''
+
+# Leaves a child running that inherits pytest's stdout and stderr, recording
+# its pid so the test can clean it up
+LEAKING_TEST = '''import subprocess
+import sys
+
+def test_leaks_child():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(20)"])
+    with open({pid_file!r}, "w") as f:
+        f.write(str(child.pid))
+'''
+
+
+@pytest.fixture
+def leaked_pid_file(tmp_path):
+    """Path a test's leaked child writes its pid to; the child is killed afterwards."""
+    pid_file = tmp_path / "leaked.pid"
+    yield pid_file
+    try:
+        os.kill(int(pid_file.read_text()), signal.SIGTERM)
+    except (OSError, ValueError):
+        pass
+
+
+def _spawn(script):
+    """Start a python child with piped stdout and stderr."""
+    return subprocess.Popen([sys.executable, "-c", script],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def _drain(reader, process):
+    """Read both pipes of process to EOF, returning the bytes per pipe."""
+    received = {process.stdout: b"", process.stderr: b""}
+    for pipe, chunk in reader([process.stdout, process.stderr], time.time() + 30):
+        received[pipe] += chunk
+    process.wait()
+    return received[process.stdout], received[process.stderr]
+
+
+class TestReadChunks:
+    @pytest.mark.parametrize("reader", READERS)
+    def test_output_after_exit_is_not_lost(self, reader):
+        """Everything a quickly exiting child wrote is still read."""
+        process = _spawn("import sys; sys.stdout.write('o' * 300000); sys.stderr.write('err')")
+        stdout, stderr = _drain(reader, process)
+        assert stdout == b"o" * 300000
+        assert stderr == b"err"
+
+    @pytest.mark.parametrize("reader", READERS)
+    def test_stops_at_deadline(self, reader):
+        """A child that never closes its pipes doesn't block past the deadline."""
+        process = _spawn("import time; time.sleep(30)")
+        try:
+            start = time.time()
+            list(reader([process.stdout, process.stderr], time.time() + 0.2))
+            assert time.time() - start < 5
+        finally:
+            process.kill()
+            process.wait()
+
+    @pytest.mark.parametrize("reader", READERS)
+    def test_stops_when_process_exits(self, reader, leaked_pid_file):
+        """A leaked grandchild holding the pipes doesn't keep reading past the exit."""
+        process = _spawn(
+            "import subprocess, sys; print('done', flush=True); "
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(20)']); "
+            f"open({str(leaked_pid_file)!r}, 'w').write(str(child.pid))"
+        )
+        start = time.time()
+        received = b"".join(chunk for pipe, chunk in reader(
+            [process.stdout, process.stderr], time.time() + 15, process
+        ) if pipe is process.stdout)
+        assert time.time() - start < 5
+        assert received.strip() == b"done"
+        process.wait()
+
+
+class TestMonitorTestExecution:
+    @pytest.mark.parametrize("reader", READERS)
+    def test_counts_real_run(self, tmp_path, monkeypatch, reader):
+        """Both readers count a short pytest run in full."""
+        monkeypatch.setattr(realtime_monitor, "_read_chunks", reader)
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_sample.py").write_text(PASSING_TEST)
+
+        results = RealTimeTestMonitor(timeout=60).monitor_test_execution(str(tmp_path))
+        assert results["return_code"] == 0
+        assert results["total_tests"] == 2
+        assert results["passed_tests"] == 2
+        assert any(name.endswith("test_sample.py::test_sleeps") for name in results["test_durations"])
+
+    @pytest.mark.parametrize("reader", READERS)
+    def test_leaked_child_does_not_hold_until_timeout(self, tmp_path, monkeypatch, reader,
+                                                      leaked_pid_file):
+        """The run ends with pytest, not when a child a test started exits."""
+        monkeypatch.setattr(realtime_monitor, "_read_chunks", reader)
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_leak.py").write_text(
+            LEAKING_TEST.format(pid_file=str(leaked_pid_file))
+        )
+
+        results = RealTimeTestMonitor(timeout=15).monitor_test_execution(str(tmp_path))
+        assert "error" not in results
+        assert results["return_code"] == 0
+        assert results["passed_tests"] == 1
+        assert results["execution_time"] < 10
+
+
+class TestOutputParsing:
+    @pytest.mark.parametrize("line", SAMPLE_LINES)
+    def test_result_regexes_match_lazy_forms(self, line):
+        """The linear-time regexes capture what the lazy originals did."""
+        for fast, lazy in ((_TEST_RE, _LAZY_TEST_RE), (_DURATION_RE, _LAZY_DURATION_RE)):
+            fast_match, lazy_match = fast.match(line), lazy.match(line)
+            assert (fast_match is None) == (lazy_match is None)
+            if fast_match:
+                assert fast_match.groups() == lazy_match.groups()
+
+    @pytest.mark.parametrize("text", [
+        "mock_get.assert_called_once()",
+        "<MagicMock id='1'>",
+        "with PATCH('x') AS MOCK_X:",
+        "client.side_effect = ValueError",
+        "nothing to see here",
+        "",
+    ])
+    def test_literal_prefilter_without_automaton(self, monkeypatch, text):
+        """The prefilter agrees with and without pyahocorasick and never hides a match."""
+        with_automaton = _may_contain_mock_output(text)
+        monkeypatch.setattr(realtime_monitor, "_mock_literal_automaton", None)
+        assert _may_contain_mock_output(text) == with_automaton
+        if any(pattern.search(text) for pattern, _ in _MOCK_PATTERNS):
+            assert with_automaton
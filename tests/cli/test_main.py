@@ -1,4 +1,6 @@
 """Tests for the CLI main module."""
+import json
+
 import pytest
 from unittest.mock import Mock, patch
 
@@ -36,4 +38,37 @@ def test_cli_commands_registered():
         assert "claude-test" in result.stdout.lower()
         
     except ImportError as e:
-        pytest.skip(f"CLI testing not available: {e}")
\ No newline at end of file
+        pytest.skip(f"CLI testing not available: {e}")
+
+
+def test_llm_analyze_cache_options(tmp_path, monkeypatch):
+    """--no-cache always asks the LLM; --cache-dir picks where answers are kept."""
+    pytest.importorskip("typer")
+    from claude_test_reporter.analyzers import llm_test_analyzer
+    from claude_test_reporter.cli.main import llm_analyze
+
+    calls = []
+
+    def fake_call_llm(**kwargs):
+        calls.append(kwargs)
+        return json.dumps({"summary": {}})
+
+    monkeypatch.setattr(llm_test_analyzer, "call_llm", fake_call_llm)
+    monkeypatch.chdir(tmp_path)
+    results = tmp_path / "results.json"
+    results.write_text(json.dumps({"total": 1, "passed": 1, "failed": 0}))
+
+    def run(cache_dir, no_cache):
+        llm_analyze(results, "demo", model="test-model", output=tmp_path / "out.json",
+                    temperature=0.0, cache_dir=cache_dir, no_cache=no_cache)
+
+    run(tmp_path / "cache", no_cache=True)
+    run(tmp_path / "cache", no_cache=True)
+    assert len(calls) == 2
+    assert not (tmp_path / "cache").exists()
+
+    run(tmp_path / "cache", no_cache=False)
+    run(tmp_path / "cache", no_cache=False)
+    assert len(calls) == 3
+    assert any((tmp_path / "cache").iterdir())
+    assert not (tmp_path / ".llm_cache").exists()
@@ -0,0 +1,56 @@
+"""Tests for loading pytest-json-report output into the agent report adapter."""
+import json
+
+import pytest
+
+from claude_test_reporter.core.adapters.agent_report_adapter import AgentReportAdapter
+
+REPORT = {
+    "created": 1700000000.0,
+    "duration": 1.5,
+    "tests": [
+        {"nodeid": "tests/test_a.py::test_ok", "outcome": "passed", "duration": 0.2},
+        {
+            "nodeid": "tests/test_a.py::test_bad",
+            "outcome": "failed",
+            "duration": 0.1,
+            "call": {"longrepr": "AssertionError: assert 1 == 2", "crash": {"message": "assert 1 == 2"}},
+        },
+        {"nodeid": "tests/test_a.py::test_skip", "outcome": "skipped", "duration": 0.0},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_history(tmp_path, monkeypatch):
+    """The history tracker writes .test_history into the working directory."""
+    monkeypatch.chdir(tmp_path)
+
+
+class TestLoading:
+    def test_loaded_data_matches_loading_the_file(self, tmp_path):
+        """An already-parsed report gives the same answers as reading it from disk."""
+        report_path = tmp_path / "report.json"
+        report_path.write_text(json.dumps(REPORT))
+
+        from_file = AgentReportAdapter(report_path, project_name="demo")
+        from_data = AgentReportAdapter(project_name="demo", data=REPORT)
+        assert from_data.data == from_file.data
+        assert from_data.project_name == from_file.project_name == "demo"
+        assert from_data.get_quick_status() == from_file.get_quick_status()
+        assert from_data.get_failed_tests() == from_file.get_failed_tests()
+        assert from_data.get_actionable_items() == from_file.get_actionable_items()
+
+    def test_stdlib_only_json_still_loads(self, tmp_path):
+        """Reports with NaN durations, which orjson rejects, load through the fallback."""
+        report_path = tmp_path / "report.json"
+        report_path.write_text('{"tests": [{"nodeid": "t::x", "outcome": "passed", "duration": NaN}]}')
+
+        adapter = AgentReportAdapter(report_path)
+        assert adapter.project_name == "Unknown"
+        assert adapter.get_quick_status()["passed_count"] == 1
+
+    def test_needs_a_path_or_data(self):
+        """An adapter without a report to read is an error."""
+        with pytest.raises(ValueError):
+            AgentReportAdapter()